@@ -4,7 +4,11 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from app.cache import TTLCache
+from app.ml.executor import InferenceExecutor, InferenceQueueFull
+import asyncio
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,6 +26,56 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# bcrypt costs ~200 ms of CPU per call and releases the GIL, so it runs on a
+# bounded thread pool instead of freezing the event loop during login bursts
+password_executor = InferenceExecutor(
+    "bcrypt",
+    max_workers=int(os.getenv("PASSWORD_HASH_THREADS", min(4, os.cpu_count() or 1))),
+    queue_limit=int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32))
+)
+
+async def run_password_work(fn, *args):
+    try:
+        return await password_executor.run(fn, *args)
+    except InferenceQueueFull:
+        # Shed load instead of queueing logins behind seconds of hashing
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_work(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_password_work(get_password_hash, password)
+
+def password_batch_hasher(loop: asyncio.AbstractEventLoop):
+    """hash_passwords for bulk work running in a thread off `loop`, e.g. a
+    roster import. Passwords go through password_executor one wave of
+    max_workers at a time, so logins and signups wait behind at most one
+    wave instead of a whole batch, and the import waits (rather than
+    failing) while the queue is full"""
+    async def hash_one(password: str) -> str:
+        while True:
+            try:
+                return await password_executor.run(get_password_hash, password)
+            except InferenceQueueFull:
+                await asyncio.sleep(0.5)
+    
+    def hash_passwords(passwords: list) -> list:
+        hashes = []
+        for start in range(0, len(passwords), password_executor.max_workers):
+            wave = [
+                asyncio.run_coroutine_threadsafe(hash_one(password), loop)
+                for password in passwords[start:start + password_executor.max_workers]
+            ]
+            hashes.extend(future.result() for future in wave)
+        return hashes
+    
+    return hash_passwords
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -33,7 +87,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Decoded tokens, so repeat requests skip signature verification; expiry is
+# still checked on every hit
+token_cache = TTLCache(
+    max_size=int(os.getenv("TOKEN_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", 60))
+)
+
 def verify_token(token: str):
+    payload = token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) < time.time():
+            token_cache.invalidate(token)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        return payload
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -42,6 +113,7 @@ def verify_token(token: str):
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials"
             )
+        token_cache.set(token, payload)
         return payload
     except JWTError:
         raise HTTPException(
@@ -0,0 +1,194 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after `ttl` seconds.
+
+    All operations take a lock, so the cache can be shared between the
+    event loop and executor threads. `max_size=0` disables caching.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0
+        }
+
+class SQLiteCache:
+    """On-disk key/value tier that survives restarts.
+
+    Values are stored as JSON; once the table exceeds `max_entries` the
+    least recently used tenth is deleted in one statement. A hit only
+    rewrites its access time once it is `touch_interval` seconds stale, so
+    hot keys are read without a write and commit on every lookup.
+    """
+
+    def __init__(self, path: str, max_entries: int, touch_interval: float = 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed)")
+        self._conn.commit()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, accessed FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] > self.touch_interval:
+                self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, accessed) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if size > self.max_entries:
+                evict = size - self.max_entries + self.max_entries // 10
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)", (evict,)
+                )
+                self.evictions += evict
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0
+        }
+
+class TieredCache:
+    """In-memory TTLCache in front of an optional SQLiteCache.
+
+    Disk hits are promoted to memory; writes go to both tiers.
+    """
+
+    def __init__(self, memory: TTLCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+        # Metrics across both tiers
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
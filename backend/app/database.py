@@ -1,26 +1,159 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Configure engine based on database type
-if DATABASE_URL and DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}
+# Pool settings; SQLite file databases get the same pool, Postgres also
+# pre-pings and recycles so connections dropped by a proxy aren't handed out
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer, and busy_timeout makes a blocked writer wait instead of
+# failing with "database is locked"
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024)),
+    "temp_store": "MEMORY"
+}
+
+class PoolStats:
+    """Checkout counters for one pool, shared with the diagnostics endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self, pool) -> dict:
+        attempts = self.checkouts + self.timeouts
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0,
+            "max_wait_ms": round(self.max_wait * 1000, 3)
+        }
+
+class TimedPoolMixin:
+    """Times every checkout, including waits for a connection to come back"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+    def recreate(self):
+        # Keep the counters across dispose()
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def engine_options(url, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for the SQLite or Postgres profile"""
+    url = make_url(url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; keep the default pool
+            return options
+    else:
+        options.update(pool_pre_ping=DB_POOL_PRE_PING, pool_recycle=DB_POOL_RECYCLE)
+    
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT
     )
-else:
-    # For PostgreSQL/Supabase
-    engine = create_engine(DATABASE_URL)
+    return options
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, TimedPoolMixin):
+        return {"pool": type(pool).__name__}
+    return pool.stats.as_dict(pool)
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", apply_sqlite_pragmas)
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url(url: str):
+    """The same database through an asyncio driver: aiosqlite or asyncpg"""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    
+    # asyncpg spells libpq's sslmode as ssl
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+# Request handlers use the async engine so a slow query doesn't stall the
+# event loop; scripts, the rescoring job and bulk imports keep the sync one
+async_engine = create_async_engine(async_database_url(DATABASE_URL), **engine_options(DATABASE_URL, is_async=True))
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -30,4 +163,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency for getting an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
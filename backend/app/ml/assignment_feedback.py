@@ -1,51 +1,514 @@
-from transformers import pipeline
+import argparse
+import itertools
+import json
+import os
 import re
+import sys
+import threading
+import time
+import unicodedata
 
-# Load sentiment analysis model (lightweight)
-try:
-    sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-except:
-    print("⚠️ Transformers model not loaded. Install with: pip install transformers torch")
-    sentiment_analyzer = None
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Texts per padded forward pass when scoring a batch
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", 16))
+
+# Words per sentiment chunk; ~1.3 WordPiece tokens per English word keeps a
+# chunk inside DistilBERT's 512-token window
+SENTIMENT_CHUNK_WORDS = int(os.getenv("SENTIMENT_CHUNK_WORDS", 300))
+
+# One tokenizer pass: each match is (preceding whitespace, word)
+WORD = re.compile(r"(\s*)(\S+)")
+I_PHRASE_WORDS = ("am", "have", "will")
+
+# Files picked up by bulk grading (--dir and grading jobs)
+SUBMISSION_EXTENSIONS = (".txt", ".md")
+
+# Directory written by --export-shared-weights; its weights are memory-mapped
+# so every uvicorn worker shares one page-cache copy of them
+SENTIMENT_SHARED_WEIGHTS_DIR = os.getenv("SENTIMENT_SHARED_WEIGHTS_DIR")
+
+# Directory written by --export-quantized; Linear layers hold int8 weights
+# (a quarter of their fp32 size) and run int8 matmuls on CPU
+SENTIMENT_QUANTIZED_DIR = os.getenv("SENTIMENT_QUANTIZED_DIR")
+
+# Minimum label agreement with the fp32 model before a quantized export is saved
+QUANTIZED_MIN_AGREEMENT = float(os.getenv("QUANTIZED_MIN_AGREEMENT", 0.95))
+
+# Fixed corpus for the fp32 vs int8 label-parity check
+PARITY_CORPUS = [
+    "This essay presents a clear and convincing argument with strong evidence.",
+    "The analysis is thorough and the conclusions follow naturally from the data.",
+    "I really enjoyed researching this topic and learned a great deal.",
+    "The writing is well organized and easy to follow from start to finish.",
+    "Excellent use of sources; each claim is supported by a citation.",
+    "The experiment worked beautifully and confirmed our hypothesis.",
+    "Overall this approach is promising and deserves further study.",
+    "The author explains each step of the derivation carefully.",
+    "Our group collaborated well and the final design is elegant.",
+    "The results were better than expected and the model generalizes well.",
+    "The argument is confusing and the evidence does not support the claims.",
+    "I struggled with this assignment and the results are disappointing.",
+    "The data was poorly organized and several figures are missing.",
+    "This report is too short and ignores the main research question.",
+    "The method failed on most test cases and the errors were never explained.",
+    "Unfortunately the survey had too few responses to draw any conclusion.",
+    "The conclusion contradicts the introduction and nothing is resolved.",
+    "The code crashed repeatedly and I ran out of time to fix it.",
+    "Many sentences are vague, repetitive and hard to understand.",
+    "The sources are outdated and some of them are unreliable.",
+    "The study measured reaction times in forty participants.",
+    "Section two describes the dataset and the preprocessing steps.",
+    "However, the sample size was small and the results may not generalize.",
+    "The second method is faster but slightly less accurate than the first.",
+]
+
+# Bump whenever heuristics, scoring or chunking change, so cached analyses
+# from the previous version are recomputed
+ANALYSIS_VERSION = 2
+
+def analyzer_version() -> str:
+    """Everything that can change an analysis result, for cache keys"""
+    variant = "int8" if SENTIMENT_QUANTIZED_DIR else "fp32"
+    return f"{ANALYSIS_VERSION}:{SENTIMENT_MODEL}:{variant}:{SENTIMENT_CHUNK_WORDS}"
+
+def normalize_text(text: str) -> str:
+    """Canonical form of submitted text: NFC Unicode and \n line endings"""
+    return unicodedata.normalize("NFC", text.replace("\r\n", "\n"))
+
+# Workers that don't serve feedback can skip torch entirely (main.py --no-nlp)
+def nlp_enabled() -> bool:
+    return os.getenv("NLP_ENABLED", "true").lower() == "true"
+
+def export_shared_weights(out_dir: str):
+    """Save config, tokenizer and a flat torch state dict that can be mmap-loaded"""
+    import torch
+    from transformers import pipeline
+    
+    analyzer = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+    os.makedirs(out_dir, exist_ok=True)
+    analyzer.model.config.save_pretrained(out_dir)
+    analyzer.tokenizer.save_pretrained(out_dir)
+    torch.save(analyzer.model.state_dict(), os.path.join(out_dir, "weights.pt"))
+    print(f"✅ Shared sentiment weights saved to '{out_dir}'")
+
+def load_shared_pipeline(weights_dir: str):
+    """Build the pipeline with parameters backed by a read-only mmap of weights.pt"""
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer, pipeline
+    
+    config = AutoConfig.from_pretrained(weights_dir)
+    model = AutoModelForSequenceClassification.from_config(config)
+    state = torch.load(os.path.join(weights_dir, "weights.pt"), mmap=True, weights_only=True)
+    # assign=True keeps the mapped tensors instead of copying into fresh ones
+    model.load_state_dict(state, assign=True)
+    model.eval()
+    
+    tokenizer = AutoTokenizer.from_pretrained(weights_dir)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+def quantize_model(model):
+    """int8 dynamic quantization of every Linear layer (activations stay fp32)"""
+    import torch
+    
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def label_parity(reference, candidate, texts: list = PARITY_CORPUS) -> dict:
+    """Compare two sentiment pipelines' labels and scores on `texts`"""
+    expected = reference(texts, batch_size=SENTIMENT_BATCH_SIZE, truncation=True)
+    actual = candidate(texts, batch_size=SENTIMENT_BATCH_SIZE, truncation=True)
+    matches = sum(e['label'] == a['label'] for e, a in zip(expected, actual))
+    return {
+        "texts": len(texts),
+        "agreement": matches / len(texts),
+        "max_score_diff": max(abs(e['score'] - a['score']) for e, a in zip(expected, actual)),
+        "mismatches": [text for text, e, a in zip(texts, expected, actual) if e['label'] != a['label']]
+    }
+
+def export_quantized_model(out_dir: str) -> dict:
+    """Quantize the locally cached fp32 model, check label parity and save to `out_dir`"""
+    import torch
+    from transformers import pipeline
+    
+    reference = pipeline("sentiment-analysis", model=SENTIMENT_MODEL, model_kwargs={"local_files_only": True})
+    # quantize_dynamic copies the model, so the reference keeps its fp32 weights
+    quantized = pipeline("sentiment-analysis", model=quantize_model(reference.model), tokenizer=reference.tokenizer)
+    
+    parity = label_parity(reference, quantized)
+    if parity["agreement"] < QUANTIZED_MIN_AGREEMENT:
+        raise ValueError(
+            f"int8 model agrees on {parity['agreement']:.0%} of labels (need {QUANTIZED_MIN_AGREEMENT:.0%}); "
+            f"not saving {out_dir}. Mismatches: {parity['mismatches']}"
+        )
+    
+    os.makedirs(out_dir, exist_ok=True)
+    reference.model.config.save_pretrained(out_dir)
+    reference.tokenizer.save_pretrained(out_dir)
+    torch.save(quantized.model.state_dict(), os.path.join(out_dir, "weights_int8.pt"))
+    print(f"✅ Quantized sentiment model saved to '{out_dir}' "
+          f"({parity['agreement']:.0%} label agreement on {parity['texts']} texts, max score diff {parity['max_score_diff']:.3f})")
+    return parity
+
+def load_quantized_pipeline(model_dir: str):
+    """Rebuild the quantized module structure, then load the saved int8 weights"""
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer, pipeline
+    
+    config = AutoConfig.from_pretrained(model_dir)
+    model = quantize_model(AutoModelForSequenceClassification.from_config(config).eval())
+    model.load_state_dict(torch.load(os.path.join(model_dir, "weights_int8.pt"), weights_only=True))
+    
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+def check_quantized_parity(model_dir: str) -> dict:
+    """Label parity of a saved int8 export against the cached fp32 model"""
+    from transformers import pipeline
+    
+    reference = pipeline("sentiment-analysis", model=SENTIMENT_MODEL, model_kwargs={"local_files_only": True})
+    parity = label_parity(reference, load_quantized_pipeline(model_dir))
+    print(f"{'✅' if parity['agreement'] >= QUANTIZED_MIN_AGREEMENT else '❌'} "
+          f"{parity['agreement']:.0%} label agreement on {parity['texts']} texts, max score diff {parity['max_score_diff']:.3f}")
+    for text in parity["mismatches"]:
+        print(f"   mismatch: {text}")
+    return parity
+
+# The pipeline is built on first use (or by warmup_sentiment at startup),
+# so importing this module never pulls in transformers or torch
+sentiment_analyzer = None
+_sentiment_lock = threading.Lock()
+_sentiment_status = {"state": "not_loaded", "variant": None, "load_seconds": None, "warmup_seconds": None}
+
+def get_sentiment_analyzer():
+    """The shared sentiment pipeline, loading it once; None if unavailable"""
+    global sentiment_analyzer
+    if _sentiment_status["state"] in ("ready", "unavailable", "disabled"):
+        return sentiment_analyzer
+    
+    with _sentiment_lock:
+        if _sentiment_status["state"] == "not_loaded":
+            if not nlp_enabled():
+                _sentiment_status["state"] = "disabled"
+                return None
+            
+            _sentiment_status["state"] = "loading"
+            started = time.perf_counter()
+            try:
+                if SENTIMENT_QUANTIZED_DIR:
+                    _sentiment_status["variant"] = "int8"
+                    sentiment_analyzer = load_quantized_pipeline(SENTIMENT_QUANTIZED_DIR)
+                elif SENTIMENT_SHARED_WEIGHTS_DIR:
+                    _sentiment_status["variant"] = "fp32-shared"
+                    sentiment_analyzer = load_shared_pipeline(SENTIMENT_SHARED_WEIGHTS_DIR)
+                else:
+                    from transformers import pipeline
+                    _sentiment_status["variant"] = "fp32"
+                    sentiment_analyzer = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+                _sentiment_status["state"] = "ready"
+            except:
+                # stderr, so NDJSON on stdout (--dir) stays parseable
+                print("⚠️ Transformers model not loaded. Install with: pip install transformers torch", file=sys.stderr)
+                sentiment_analyzer = None
+                _sentiment_status["state"] = "unavailable"
+            _sentiment_status["load_seconds"] = round(time.perf_counter() - started, 3)
+    
+    return sentiment_analyzer
+
+def warmup_sentiment() -> dict:
+    """Load the pipeline and run one dummy inference so the first request is fast"""
+    analyzer = get_sentiment_analyzer()
+    if analyzer is not None and _sentiment_status["warmup_seconds"] is None:
+        started = time.perf_counter()
+        sentiment_scores(["Warm-up sentence for the sentiment model."])
+        _sentiment_status["warmup_seconds"] = round(time.perf_counter() - started, 3)
+    return sentiment_status()
+
+def sentiment_status() -> dict:
+    return dict(_sentiment_status)
+
+def sentiment_scores(texts: list) -> list:
+    """Positive-sentiment probability per text (0.5 when the model is unavailable).
+    
+    Texts are sorted by token count before batching, so each padded forward
+    pass holds similar lengths and wastes little compute on padding.
+    """
+    scores = [0.5] * len(texts)  # neutral default
+    if not texts:
+        return scores
+    sentiment_analyzer = get_sentiment_analyzer()
+    if sentiment_analyzer is None:
+        return scores
+    
+    try:
+        # truncation caps each text at the model's 512-token window
+        lengths = [len(ids) for ids in sentiment_analyzer.tokenizer(texts, truncation=True)["input_ids"]]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        results = sentiment_analyzer([texts[i] for i in order], batch_size=SENTIMENT_BATCH_SIZE, truncation=True)
+        for i, sentiment in zip(order, results):
+            scores[i] = sentiment['score'] if sentiment['label'] == 'POSITIVE' else 1 - sentiment['score']
+    except:
+        pass
+    return scores
+
+class TextStats:
+    """Word, sentence and grammar-heuristic counts built in one pass over text
+    that may arrive in pieces (e.g. an uploaded file read block by block).
+    
+    Each piece is tokenized once into (whitespace, word) pairs. A trailing
+    partial word is carried into the next piece, so memory stays bounded by
+    the piece size. Completed words are grouped into sentiment chunks of
+    `chunk_words` words, which feed() and close() hand back as they fill.
+    """
+    
+    def __init__(self, chunk_words: int = None):
+        self.chunk_words = chunk_words or SENTIMENT_CHUNK_WORDS
+        self.word_count = 0
+        self.sentence_count = 0
+        self.first_char = None
+        self.double_space = False
+        self.lowercase_i = False
+        self.i_phrase = False
+        self._offset = 0
+        self._first_word_at = None
+        self._last_word_end = 0
+        self._carry = ""
+        self._in_sentence = False
+        self._prev_word = ""
+        self._pending_i = False
+        self._chunk = []
+    
+    @property
+    def stripped_length(self) -> int:
+        """len(text.strip()) of everything fed so far"""
+        return 0 if self._first_word_at is None else self._last_word_end - self._first_word_at
+    
+    def feed(self, piece: str) -> list:
+        if not piece:
+            return []
+        if self.first_char is None:
+            self.first_char = piece[0]
+        
+        text = self._carry + piece
+        # Hold back the last word (and the whitespace before it); it may continue in the next piece
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        while cut and text[cut - 1].isspace():
+            cut -= 1
+        self._carry = text[cut:]
+        return self._tokenize(text[:cut])
+    
+    def close(self) -> list:
+        chunks = self._tokenize(self._carry)
+        trailing = self._carry[len(self._carry.rstrip()):]
+        self._carry = ""
+        self._gap(trailing)
+        
+        if self._in_sentence:
+            self.sentence_count += 1
+            self._in_sentence = False
+        if self._chunk:
+            chunks.append(" ".join(self._chunk))
+            self._chunk = []
+        return chunks
+    
+    def _tokenize(self, text: str) -> list:
+        chunks = []
+        for match in WORD.finditer(text):
+            gap, word = match.groups()
+            self._gap(gap)
+            self._word(gap, word, self._offset + match.start(2))
+            
+            self._chunk.append(word)
+            if len(self._chunk) >= self.chunk_words:
+                chunks.append(" ".join(self._chunk))
+                self._chunk = []
+        self._offset += len(text)
+        return chunks
+    
+    def _gap(self, gap: str):
+        if '  ' in gap:
+            self.double_space = True
+        # A lone "i" needs a space on both sides, as in ' i ' in text.lower()
+        if self._pending_i and gap.startswith(' '):
+            self.lowercase_i = True
+        self._pending_i = False
+    
+    def _word(self, gap: str, word: str, start: int):
+        if self._first_word_at is None:
+            self._first_word_at = start
+        self._last_word_end = start + len(word)
+        self.word_count += 1
+        
+        if word.lower() == 'i' and gap.endswith(' '):
+            self._pending_i = True
+        if gap == ' ' and self._prev_word.endswith('I') and word.startswith(I_PHRASE_WORDS):
+            self.i_phrase = True
+        self._prev_word = word
+        
+        # Sentences are the non-blank runs between periods
+        if '.' not in word:
+            self._in_sentence = True
+            return
+        parts = word.split('.')
+        for part in parts[:-1]:
+            if part or self._in_sentence:
+                self.sentence_count += 1
+            self._in_sentence = False
+        if parts[-1]:
+            self._in_sentence = True
+
+class SentimentAverage:
+    """Length-weighted mean of per-chunk positive-sentiment scores"""
+    
+    def __init__(self):
+        self.total = 0.0
+        self.weight = 0
+    
+    def add(self, chunks: list, scores: list):
+        for chunk, score in zip(chunks, scores):
+            self.total += score * len(chunk)
+            self.weight += len(chunk)
+    
+    def score(self) -> float:
+        return self.total / self.weight if self.weight else 0.5  # neutral default
+
+def analyze_stream(pieces) -> dict:
+    """Analyze text arriving as an iterable of pieces in bounded memory,
+    scoring sentiment chunks in batches as they fill"""
+    stats = TextStats()
+    sentiment = SentimentAverage()
+    pending = []
+    
+    for piece in pieces:
+        pending.extend(stats.feed(piece))
+        if len(pending) >= SENTIMENT_BATCH_SIZE:
+            sentiment.add(pending, sentiment_scores(pending))
+            pending = []
+    
+    pending.extend(stats.close())
+    if pending and stats.stripped_length >= 50:
+        sentiment.add(pending, sentiment_scores(pending))
+    return assignment_report(stats, sentiment.score())
+
+def analyze_assignments(texts: list) -> list:
+    """Analyze many assignments with one batched sentiment pass over all their chunks"""
+    all_stats, all_chunks, owners = [], [], []
+    for i, text in enumerate(texts):
+        stats = TextStats()
+        chunks = stats.feed(text) + stats.close()
+        all_stats.append(stats)
+        if stats.stripped_length >= 50:
+            all_chunks.extend(chunks)
+            owners.extend([i] * len(chunks))
+    
+    averages = [SentimentAverage() for _ in texts]
+    for owner, chunk, score in zip(owners, all_chunks, sentiment_scores(all_chunks)):
+        averages[owner].add([chunk], [score])
+    return [assignment_report(stats, average.score()) for stats, average in zip(all_stats, averages)]
 
 def analyze_assignment(text: str) -> dict:
     """Analyze assignment text and provide feedback"""
+    return analyze_assignments([text])[0]
+
+def file_metrics(path: str) -> tuple:
+    """Read one submission in blocks and return (path, TextStats, sentiment chunks).
+    Cheap CPU work, run in a process pool by grade_files"""
+    stats = TextStats()
+    chunks = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for piece in iter(lambda: f.read(64 * 1024), ''):
+            chunks.extend(stats.feed(piece))
+    chunks.extend(stats.close())
+    return path, stats, chunks if stats.stripped_length >= 50 else []
+
+def submission_files(directory: str) -> list:
+    """Every .txt/.md file under `directory`, in sorted order"""
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if name.lower().endswith(SUBMISSION_EXTENSIONS))
+    return sorted(paths)
+
+def grade_files(paths: list, workers: int = None, pool=None, score=sentiment_scores):
+    """Yield one result dict per file, in completion order.
     
-    if not text or len(text.strip()) < 50:
+    Text metrics fan out over a process pool (at most 4 files in flight per
+    worker); finished files are queued until they hold a sentiment batch
+    worth of chunks, then scored with one batched `score` call. `pool` is an
+    existing executor to share (the API's grading pool); without one, a
+    pool of `workers` processes is created for this run.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    
+    workers = workers or os.cpu_count() or 1
+    queue = iter(paths)
+    ready = []  # (path, stats, chunks) waiting for sentiment
+    
+    def flush():
+        chunks = [chunk for _, _, file_chunks in ready for chunk in file_chunks]
+        scores = iter(score(chunks))
+        for path, stats, file_chunks in ready:
+            average = SentimentAverage()
+            average.add(file_chunks, [next(scores) for _ in file_chunks])
+            yield {"file": path, **assignment_report(stats, average.score())}
+        ready.clear()
+    
+    owned = pool is None
+    if owned:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    running = {}
+    try:
+        running = {pool.submit(file_metrics, path): path for path in itertools.islice(queue, workers * 4)}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                next_path = next(queue, None)
+                if next_path is not None:
+                    running[pool.submit(file_metrics, next_path)] = next_path
+                try:
+                    ready.append(future.result())
+                except Exception as exc:
+                    yield {"file": path, "error": str(exc)}
+            
+            if not running or sum(len(chunks) for _, _, chunks in ready) >= SENTIMENT_BATCH_SIZE:
+                yield from flush()
+    finally:
+        # A shared pool outlives this run, so drop our queued files from it
+        for future in running:
+            future.cancel()
+        if owned:
+            pool.shutdown()
+
+def assignment_report(stats: TextStats, sentiment_score: float) -> dict:
+    """Score and feedback from one document's counts and sentiment"""
+    
+    if stats.stripped_length < 50:
         return {
-            "word_count": len(text.split()),
+            "word_count": stats.word_count,
             "feedback": "Text too short to analyze. Please provide more content.",
             "score": 0,
             "suggestions": ["Add more detailed explanation", "Expand your arguments"]
         }
     
     # Basic metrics
-    word_count = len(text.split())
-    sentence_count = len([s for s in text.split('.') if s.strip()])
+    word_count = stats.word_count
+    sentence_count = stats.sentence_count
     avg_sentence_length = word_count / max(sentence_count, 1)
     
     # Grammar checks (simple)
     grammar_issues = []
     
     # Check for common errors
-    if ' i ' in text.lower() and not any(x in text for x in ['I am', 'I have', 'I will']):
+    if stats.lowercase_i and not stats.i_phrase:
         grammar_issues.append("Use 'I' (capital) instead of 'i'")
     
-    if text.count('  ') > 0:
+    if stats.double_space:
         grammar_issues.append("Multiple spaces detected")
     
-    if not text[0].isupper():
+    if not stats.first_char.isupper():
         grammar_issues.append("Text should start with capital letter")
     
-    # Sentiment analysis
-    sentiment_score = 0.5  # neutral default
-    if sentiment_analyzer:
-        try:
-            sentiment = sentiment_analyzer(text[:512])[0]  # Limit to 512 chars
-            sentiment_score = sentiment['score'] if sentiment['label'] == 'POSITIVE' else 1 - sentiment['score']
-        except:
-            pass
-    
     # Calculate score
     score = 50  # Base score
     
@@ -112,6 +575,46 @@ def analyze_assignment(text: str) -> dict:
 
 # Test function
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--export-shared-weights", metavar="DIR", help="save mmap-loadable sentiment weights to DIR")
+    parser.add_argument("--export-quantized", metavar="DIR", help="save an int8 dynamically quantized sentiment model to DIR")
+    parser.add_argument("--check-quantized", metavar="DIR", help="compare DIR's int8 labels with the fp32 model")
+    parser.add_argument("--file", help="analyze a text file instead of the built-in sample")
+    parser.add_argument("--dir", help="grade every .txt/.md submission under DIR, streaming NDJSON to stdout")
+    parser.add_argument("--workers", type=int, help="processes for text metrics with --dir (default: CPU count)")
+    parser.add_argument("--no-nlp", action="store_true", help="skip the sentiment model (neutral sentiment)")
+    args = parser.parse_args()
+    
+    if args.no_nlp:
+        os.environ["NLP_ENABLED"] = "false"
+    
+    if args.export_shared_weights:
+        export_shared_weights(args.export_shared_weights)
+        raise SystemExit(0)
+    
+    if args.export_quantized:
+        export_quantized_model(args.export_quantized)
+        raise SystemExit(0)
+    
+    if args.check_quantized:
+        parity = check_quantized_parity(args.check_quantized)
+        raise SystemExit(0 if parity["agreement"] >= QUANTIZED_MIN_AGREEMENT else 1)
+    
+    if args.dir:
+        paths = submission_files(args.dir)
+        started = time.perf_counter()
+        for result in grade_files(paths, args.workers):
+            print(json.dumps(result), flush=True)
+        elapsed = time.perf_counter() - started
+        print(f"✅ Graded {len(paths)} files in {elapsed:.1f}s ({len(paths) / max(elapsed, 1e-9):.1f} files/s)", file=sys.stderr)
+        raise SystemExit(0)
+    
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8', errors='replace') as f:
+            result = analyze_stream(iter(lambda: f.read(64 * 1024), ''))
+        print(result)
+        raise SystemExit(0)
+    
     sample_text = """
     The concept of machine learning has revolutionized the way we approach problem-solving 
     in computer science. Machine learning algorithms can learn from data and make predictions 
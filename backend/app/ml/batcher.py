@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Any, Callable, List
+
+try:
+    from app.ml.executor import InferenceQueueFull
+except ImportError:  # run as a script from app/ml, e.g. benchmark_sentiment.py
+    from executor import InferenceQueueFull
+
+class MicroBatcher:
+    """Coalesce concurrent single-row calls into one vectorized batch call.
+
+    `batch_fn` takes a list of items and returns a list of results in the
+    same order. Requests arriving within `max_wait_ms` of each other (up to
+    `max_batch_size` rows) share one call. When traffic is idle a lone
+    request is dispatched immediately, so low-load latency is unchanged.
+    With an `executor` (see app.ml.executor) the batch call runs off the
+    event loop, with up to `executor.max_workers` batches in flight. At most
+    `queue_limit` items (default 16 full batches) may wait for a batch;
+    further submits fail fast with InferenceQueueFull.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 64, max_wait_ms: float = 2.0, executor=None, queue_limit: int = None):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.queue_limit = max(self.max_batch_size, queue_limit or self.max_batch_size * 16)
+        self.max_in_flight = executor.max_workers if executor is not None else 1
+        self._queue = None
+        self._worker = None
+        self._loop = None
+        self._in_flight = set()
+        self._last_batch_size = 0
+
+        # Metrics
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.total_batch_time = 0.0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        if self._queue.qsize() >= self.queue_limit:
+            self.rejected += 1
+            raise InferenceQueueFull(f"batcher is saturated ({self._queue.qsize()} requests queued)")
+
+        future = self._loop.create_future()
+        self._queue.put_nowait((item, future))
+        self.requests += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+
+        # Let handlers that are already runnable enqueue before deciding
+        await asyncio.sleep(0)
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        # Idle traffic: don't hold a lone request for the batching window
+        if len(batch) == 1 and self._last_batch_size <= 1:
+            return batch
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        # Collect the next batch only once a slot is free, so requests keep
+        # coalescing while every worker is busy
+        slots = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            await slots.acquire()
+            batch = await self._collect()
+            batch = [(item, future) for item, future in batch if not future.done()]
+            self._last_batch_size = len(batch)
+            if not batch:
+                slots.release()
+                continue
+            task = self._loop.create_task(self._dispatch(batch, slots))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: list, slots: asyncio.Semaphore):
+        started = time.perf_counter()
+        items = [item for item, _ in batch]
+        try:
+            if self.executor is not None:
+                results = await self.executor.run(self.batch_fn, items)
+            else:
+                results = self.batch_fn(items)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            slots.release()
+        self.batches += 1
+        self.total_batch_time += time.perf_counter() - started
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_limit": self.queue_limit,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0,
+            "avg_batch_ms": round(self.total_batch_time / self.batches * 1000, 3) if self.batches else 0
+        }
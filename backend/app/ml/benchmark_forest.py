@@ -0,0 +1,43 @@
+import numpy as np
+import joblib
+import time
+from compiled_forest import compile_forest
+
+BATCH_SIZES = [1, 64, 10000]
+
+def time_call(fn, X, repeats):
+    fn(X)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def benchmark_forest():
+    print("=" * 50)
+    print("COMPILED FOREST vs SKLEARN")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+
+    for name, method in [('dropout', 'predict_proba'), ('gpa', 'predict')]:
+        model = joblib.load(f'{name}_model.pkl')
+        # Benchmark the raw traversal; serving hands big batches back to sklearn
+        compiled = compile_forest(model, fallback_min_rows=None)
+        print(f"\n📊 {name}_model.{method} ({model.n_estimators} trees)")
+        print(f"   {'rows':>6} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8} {'parity':>7}")
+
+        for n_rows in BATCH_SIZES:
+            # Models are trained on standardized features
+            X = rng.normal(size=(n_rows, model.n_features_in_))
+            repeats = 200 if n_rows < 1000 else 10
+
+            sklearn_fn = getattr(model, method)
+            compiled_fn = getattr(compiled, method)
+            parity = np.array_equal(sklearn_fn(X), compiled_fn(X))
+
+            sklearn_ms = time_call(sklearn_fn, X, repeats)
+            compiled_ms = time_call(compiled_fn, X, repeats)
+            print(f"   {n_rows:>6} {sklearn_ms:>12.3f} {compiled_ms:>12.3f} {sklearn_ms / compiled_ms:>7.1f}x {'✅' if parity else '❌':>6}")
+
+if __name__ == "__main__":
+    benchmark_forest()
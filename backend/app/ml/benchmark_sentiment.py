@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from assignment_feedback import analyze_assignments, get_sentiment_analyzer, sentiment_scores, sentiment_status, warmup_sentiment
+from batcher import MicroBatcher
+from executor import InferenceExecutor
+
+# CPU-only throughput of /analyze-assignment's NLP path, one request per text
+# vs. micro-batched into padded DistilBERT batches (same code as the router).
+# With --workers N the batched run is repeated on N process workers, as with
+# NLP_PROCESS_WORKERS=N, to show throughput scaling with cores.
+# With --quantized DIR it instead compares fp32 and int8 latency and RSS, each
+# variant in a fresh process so their memory doesn't mix:
+#   python benchmark_sentiment.py --quantized sentiment_int8
+CONCURRENCY = [1, 8, 32]
+DURATION = 10  # seconds per run
+
+SENTENCES = [
+    "The experiment supports the hypothesis that sleep improves recall.",
+    "However, the sample size was small and the results may not generalize.",
+    "I found the second method confusing and the data was poorly organized.",
+    "Overall this approach is promising and deserves further study.",
+    "The author clearly explains each step of the derivation.",
+]
+
+def make_texts(n, rng):
+    # Mixed lengths, so grouping by token count has something to do
+    return [" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 12))) for _ in range(n)]
+
+async def measure(concurrency, batching, texts, process_workers=0):
+    executor = InferenceExecutor(
+        "nlp",
+        max_workers=process_workers or 1,
+        queue_limit=concurrency,
+        processes=process_workers > 0,
+        initializer=warmup_sentiment if process_workers > 0 else None
+    )
+    if process_workers:
+        # Start and warm every worker before the clock starts
+        await asyncio.gather(*(executor.run(warmup_sentiment) for _ in range(process_workers)))
+    batcher = MicroBatcher(analyze_assignments, max_batch_size=16, max_wait_ms=10, executor=executor)
+    completed = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def client(offset):
+        nonlocal completed
+        i = offset
+        while time.perf_counter() < deadline:
+            text = texts[i % len(texts)]
+            if batching:
+                await batcher.submit(text)
+            else:
+                await executor.run(analyze_assignments, [text])
+            completed += 1
+            i += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+    return completed / elapsed, batcher.stats()["avg_batch_size"] if batching else 1
+
+def benchmark_sentiment(process_workers=0):
+    if get_sentiment_analyzer() is None:
+        print("❌ Sentiment model unavailable; install transformers and torch first")
+        return
+
+    print("=" * 50)
+    print("SENTIMENT THROUGHPUT (requests/s, CPU)")
+    print("=" * 50)
+
+    texts = make_texts(256, random.Random(42))
+    analyze_assignments(texts[:16])  # warm up
+
+    header = f"   {'clients':>7} {'unbatched':>10} {'batched':>10} {'avg batch':>10} {'speedup':>8}"
+    if process_workers:
+        header += f" {f'{process_workers} procs':>10} {'speedup':>8}"
+    print(header)
+    for concurrency in CONCURRENCY:
+        single, _ = asyncio.run(measure(concurrency, False, texts))
+        batched, avg_batch = asyncio.run(measure(concurrency, True, texts))
+        row = f"   {concurrency:>7} {single:>10.1f} {batched:>10.1f} {avg_batch:>10.1f} {batched / single:>7.1f}x"
+        if process_workers:
+            scaled, _ = asyncio.run(measure(concurrency, True, texts, process_workers))
+            row += f" {scaled:>10.1f} {scaled / single:>7.1f}x"
+        print(row)
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+
+def measure_variant():
+    """Run in a child process: load the configured variant, time it, print JSON"""
+    before = rss_mb()
+    get_sentiment_analyzer()
+    loaded = rss_mb()
+    texts = make_texts(256, random.Random(42))
+    sentiment_scores(texts[:16])  # warm up
+
+    result = {"variant": sentiment_status()["variant"], "model_rss": loaded - before}
+    for batch_size, repeats in [(1, 100), (16, 20)]:
+        timings = []
+        for i in range(repeats):
+            batch = texts[i * batch_size % len(texts):][:batch_size]
+            started = time.perf_counter()
+            sentiment_scores(batch)
+            timings.append(time.perf_counter() - started)
+        result[f"p50_ms_{batch_size}"] = sorted(timings)[len(timings) // 2] * 1000
+    result["peak_rss"] = rss_mb()
+    print(json.dumps(result))
+
+def benchmark_variants(quantized_dir):
+    print("=" * 50)
+    print("FP32 vs INT8 SENTIMENT (CPU)")
+    print("=" * 50)
+    print(f"   {'variant':<8} {'model MB':>9} {'RSS MB':>8} {'p50 1 text':>11} {'p50 16 texts':>13}")
+    for variant_dir in [None, quantized_dir]:
+        env = dict(os.environ)
+        env.pop("SENTIMENT_QUANTIZED_DIR", None)
+        if variant_dir:
+            env["SENTIMENT_QUANTIZED_DIR"] = variant_dir
+        output = subprocess.run([sys.executable, __file__, "--measure-variant"], env=env, capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"   {r['variant']:<8} {r['model_rss']:>9.0f} {r['peak_rss']:>8.0f} {r['p50_ms_1']:>9.1f}ms {r['p50_ms_16']:>11.1f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quantized", metavar="DIR", help="compare fp32 with the int8 export in DIR")
+    parser.add_argument("--workers", type=int, default=0, metavar="N", help="also run the batched benchmark on N process workers")
+    parser.add_argument("--measure-variant", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_variant:
+        measure_variant()
+    elif args.quantized:
+        benchmark_variants(os.path.abspath(args.quantized))
+    else:
+        benchmark_sentiment(args.workers)
@@ -0,0 +1,281 @@
+import json
+import os
+import shutil
+import time
+import numpy as np
+from typing import Optional
+
+class CompiledForest:
+    """A trained RandomForest flattened into contiguous NumPy arrays.
+
+    Every tree's nodes are concatenated into five arrays (feature,
+    threshold, left, right, value) and all rows walk all trees together,
+    one vectorized step per tree level. Leaves point at themselves, so
+    rows that reach a leaf early just stay there.
+
+    This beats sklearn's per-estimator dispatch for small batches but not
+    its Cython traversal for large ones, so batches of `fallback_min_rows`
+    or more are handed to the original estimator when one is attached
+    (pass `fallback_min_rows=None` to always use the compiled traversal).
+
+    Outputs match sklearn bit-for-bit: inputs are cast to float32 like
+    sklearn's tree code, and per-tree leaf values are summed sequentially
+    in estimator order before dividing by the tree count, exactly as the
+    forest's predict/predict_proba accumulate them.
+
+    `fold_scaler` absorbs a fitted StandardScaler into the thresholds so
+    the forest takes raw features; such forests compare float64 inputs.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, n_features, classes=None, fallback=None, fallback_min_rows=512, input_dtype=np.float32, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        # Interleaved (left, right) pairs: child of node i is children[2 * i + went_right]
+        self.children = children if children is not None else np.stack([left, right], axis=1).ravel()
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+        self.classes_ = classes
+        self.n_estimators = len(roots)
+        self.fallback = fallback
+        self.fallback_min_rows = fallback_min_rows
+        self.input_dtype = np.dtype(input_dtype)
+
+    @classmethod
+    def from_sklearn(cls, model, fallback_min_rows: Optional[int] = 512) -> "CompiledForest":
+        is_classifier = hasattr(model, "classes_")
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            nodes = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so traversal can run a fixed depth
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+
+            # Classifier leaves already hold class fractions
+            n_values = len(model.classes_) if is_classifier else 1
+            values.append(tree.value[:, 0, :n_values])
+
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=model.classes_ if is_classifier else None,
+            fallback=model,
+            fallback_min_rows=fallback_min_rows
+        )
+
+    def fold_scaler(self, scaler) -> "CompiledForest":
+        """Return a copy that takes raw features, with `scaler` folded into the thresholds"""
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(self.n_features_in_)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(self.n_features_in_)
+        threshold = _raw_thresholds(self.threshold, mean[self.feature], scale[self.feature])
+
+        return CompiledForest(
+            feature=self.feature,
+            threshold=threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            n_features=self.n_features_in_,
+            classes=self.classes_,
+            input_dtype=np.float64
+        )
+
+    # Arrays written one .npy each, so they can be memory-mapped on load
+    ARRAYS = ["feature", "threshold", "left", "right", "children", "value", "roots"]
+    # Names the version subdirectory holding the current arrays
+    POINTER = "CURRENT"
+
+    @classmethod
+    def resolve(cls, path: str) -> str:
+        """Directory holding the current arrays: the version named by
+        path/CURRENT, or `path` itself for forests saved before versioning"""
+        try:
+            with open(os.path.join(path, cls.POINTER), 'r') as f:
+                return os.path.join(path, f.read().strip())
+        except FileNotFoundError:
+            return path
+
+    def save(self, path: str):
+        """Write the forest as a new version directory of uncompressed .npy
+        files plus meta.json under `path`, then point path/CURRENT at it.
+
+        The pointer is swapped with os.replace, so a concurrent load sees
+        either the old version or the new one, never a missing directory.
+        The previous version is kept for loads that resolved it just before
+        the swap; older ones are deleted, and processes still mapping their
+        arrays keep valid pages.
+        """
+        os.makedirs(path, exist_ok=True)
+        previous = self.resolve(path)
+        version = f"v{time.time_ns()}-{os.getpid()}"
+        staging = os.path.join(path, version)
+        os.makedirs(staging)
+        for name in self.ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), getattr(self, name), allow_pickle=False)
+        if self.classes_ is not None:
+            np.save(os.path.join(staging, "classes.npy"), self.classes_, allow_pickle=False)
+
+        with open(os.path.join(staging, "meta.json"), 'w') as f:
+            json.dump({
+                "max_depth": self.max_depth,
+                "n_features": self.n_features_in_,
+                "is_classifier": self.classes_ is not None,
+                "input_dtype": self.input_dtype.str
+            }, f)
+
+        pointer = os.path.join(path, f"{self.POINTER}.tmp-{os.getpid()}")
+        with open(pointer, 'w') as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(path, self.POINTER))
+
+        keep = {version, os.path.basename(previous)}
+        for entry in os.listdir(path):
+            entry_path = os.path.join(path, entry)
+            if entry.startswith("v") and os.path.isdir(entry_path) and entry not in keep:
+                shutil.rmtree(entry_path, ignore_errors=True)
+            elif previous != path and entry.endswith((".npy", ".json")):
+                # Pre-versioning files, two versions old by now
+                os.remove(entry_path)
+
+    @classmethod
+    def load(cls, path: str, fallback=None, fallback_min_rows: Optional[int] = 512, mmap: bool = False) -> "CompiledForest":
+        """Load a saved forest; with `mmap` the arrays stay in the shared page cache.
+
+        Every worker process that maps the same files shares one physical
+        copy, since the arrays are only ever read.
+        """
+        # Resolve the version once, so every file comes from the same save
+        directory = cls.resolve(path)
+        try:
+            with open(os.path.join(directory, "meta.json"), 'r') as f:
+                meta = json.load(f)
+
+            def read(name):
+                array = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None, allow_pickle=False)
+                # Plain ndarray view over the mapping avoids np.memmap's per-op overhead
+                return array.view(np.ndarray)
+
+            arrays = {name: read(name) for name in cls.ARRAYS}
+            classes = read("classes") if meta["is_classifier"] else None
+        except FileNotFoundError:
+            # Saves since we resolved it deleted this version; read the current one
+            if cls.resolve(path) == directory:
+                raise
+            return cls.load(path, fallback, fallback_min_rows, mmap)
+
+        return cls(
+            n_features=meta["n_features"],
+            max_depth=meta["max_depth"],
+            classes=classes,
+            fallback=fallback,
+            fallback_min_rows=fallback_min_rows,
+            input_dtype=np.dtype(meta["input_dtype"]),
+            **arrays
+        )
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf index reached by every row in every tree, shape (n_estimators, n_rows)"""
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected input with {self.n_features_in_} features, got shape {X.shape}")
+
+        # Flat indexing with take() is much cheaper than 2-D fancy indexing
+        flat_X = X.ravel()
+        row_offset = np.arange(X.shape[0]) * X.shape[1]
+        node = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_offset + self.feature.take(node))
+            node = self.children.take(2 * node + (x > self.threshold.take(node)))
+        return node
+
+    def _accumulate(self, X) -> np.ndarray:
+        leaf_values = self.value[self.apply(X)]
+
+        # Add trees one at a time, in order; a vectorized sum would use
+        # pairwise summation and drift from sklearn in the last bit
+        total = np.zeros(leaf_values.shape[1:], dtype=np.float64)
+        for tree_values in leaf_values:
+            total += tree_values
+        total /= self.n_estimators
+        return total
+
+    def _use_fallback(self, X) -> bool:
+        return (
+            self.fallback is not None
+            and self.fallback_min_rows is not None
+            and len(X) >= self.fallback_min_rows
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        if self.classes_ is None:
+            raise AttributeError("predict_proba is only available for classifiers")
+        if self._use_fallback(X):
+            return self.fallback.predict_proba(X)
+        return self._accumulate(X)
+
+    def predict(self, X) -> np.ndarray:
+        if self._use_fallback(X):
+            return self.fallback.predict(X)
+        if self.classes_ is not None:
+            return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+        return self._accumulate(X)[:, 0]
+
+_SIGN_MASK = np.int64(0x7FFFFFFFFFFFFFFF)
+_KEY_OFFSET = np.uint64(1 << 63)
+
+def _float_to_key(x: np.ndarray) -> np.ndarray:
+    # Map float64 to uint64 so that integer order matches float order
+    bits = x.view(np.int64)
+    return (bits ^ ((bits >> 63) & _SIGN_MASK)).view(np.uint64) + _KEY_OFFSET
+
+def _key_to_float(key: np.ndarray) -> np.ndarray:
+    bits = (key - _KEY_OFFSET).view(np.int64)
+    return (bits ^ ((bits >> 63) & _SIGN_MASK)).view(np.float64)
+
+def _raw_thresholds(threshold, mean, scale) -> np.ndarray:
+    """Largest raw x per node with float32((x - mean) / scale) <= threshold.
+
+    Scaling followed by the float32 cast is monotone in x, so bisecting over
+    the ordered float64 bit patterns finds the exact cut point and `x <= cut`
+    takes the same branch as the scaled comparison for every finite input.
+    """
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32) <= threshold
+
+    lo = _float_to_key(np.full(threshold.shape, -np.inf))
+    hi = _float_to_key(np.full(threshold.shape, np.inf))
+    with np.errstate(over="ignore", invalid="ignore"):
+        while np.any(hi - lo > 1):
+            mid = lo + (hi - lo) // np.uint64(2)
+            left = goes_left(_key_to_float(mid))
+            lo = np.where(left, mid, lo)
+            hi = np.where(left, hi, mid)
+    return _key_to_float(lo)
+
+def compile_forest(model, fallback_min_rows: Optional[int] = 512) -> CompiledForest:
+    """Flatten a fitted RandomForestClassifier/Regressor for fast serving"""
+    return CompiledForest.from_sklearn(model, fallback_min_rows)
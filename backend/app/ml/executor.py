@@ -0,0 +1,90 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+def _timed_call(fn: Callable, queued_at: float, *args):
+    # Runs in the worker; time.monotonic() is system-wide, so queue wait is
+    # measured correctly in process pools too
+    started = time.monotonic()
+    result = fn(*args)
+    return result, started - queued_at, time.monotonic() - started
+
+class InferenceQueueFull(Exception):
+    """Raised when an executor already has `queue_limit` calls pending"""
+
+class InferenceExecutor:
+    """Bounded pool that runs CPU-bound inference off the event loop.
+
+    Thread pools suit sklearn/NumPy, which release the GIL in their inner
+    loops; `processes=True` gives each worker its own interpreter, e.g. for
+    the transformer pipeline. `initializer` runs once in each worker as it
+    starts, e.g. to load a model per process. At most `queue_limit` calls may be running or
+    waiting at once; further calls fail fast with InferenceQueueFull.
+    """
+
+    def __init__(self, name: str, max_workers: int, queue_limit: int, processes: bool = False, initializer: Callable = None):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(self.max_workers, queue_limit)
+        self.processes = processes
+        self.initializer = initializer
+        self._pool = None
+        self.pending = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.total_run_time = 0.0
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.processes:
+                # Spawn, not fork: workers must not inherit the event loop,
+                # DB connections or threads of the API process
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name, initializer=self.initializer)
+        return self._pool
+
+    async def run(self, fn: Callable, *args) -> Any:
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise InferenceQueueFull(f"{self.name} executor is saturated ({self.pending} calls pending)")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(self._get_pool(), _timed_call, fn, time.monotonic(), *args)
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.total_wait_time += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+        self.total_run_time += ran
+        return result
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "processes": self.processes,
+            "queue_limit": self.queue_limit,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_time / self.completed * 1000, 3) if self.completed else 0,
+            "max_wait_ms": round(self.max_wait_time * 1000, 3),
+            "avg_run_ms": round(self.total_run_time / self.completed * 1000, 3) if self.completed else 0
+        }
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import joblib
+from compiled_forest import compile_forest
+
+def export_fused_model(model, scaler, X_raw, path: str):
+    """Fold `scaler` into `model`'s thresholds, check parity on X_raw and save to `path`"""
+    fused = compile_forest(model, fallback_min_rows=None).fold_scaler(scaler)
+
+    # Parity against the current scaler+model pair
+    X_raw = np.asarray(X_raw, dtype=np.float64)
+    X_scaled = scaler.transform(X_raw)
+    if hasattr(model, "classes_"):
+        parity = np.array_equal(model.predict_proba(X_scaled), fused.predict_proba(X_raw))
+    else:
+        parity = np.array_equal(model.predict(X_scaled), fused.predict(X_raw))
+
+    if not parity:
+        raise ValueError(f"Fused model does not match scaler+model on {len(X_raw)} rows; not saving {path}")
+
+    fused.save(path)
+    print(f"✅ Fused model saved as '{path}' (parity checked on {len(X_raw)} rows)")
+    return fused
+
+# Re-export fused artifacts from the current pickles without retraining
+if __name__ == "__main__":
+    df = pd.read_csv('student_data.csv')
+
+    for name in ['dropout', 'gpa']:
+        model = joblib.load(f'{name}_model.pkl')
+        scaler = joblib.load(f'{name}_scaler.pkl')
+        X = df[list(scaler.feature_names_in_)].to_numpy()
+
+        # Probe well outside the training range as well
+        rng = np.random.default_rng(42)
+        X_wide = rng.uniform(X.min(axis=0) - 5, X.max(axis=0) + 5, size=(10000, X.shape[1]))
+
+        export_fused_model(model, scaler, np.vstack([X, X_wide]), f'{name}_model_fused')
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import exists, func, insert, literal, select, update
+
+from app.models.student import Student
+from app.models.student_features import StudentFeatures
+from app.schemas.prediction import PredictionInput
+
+students = Student.__table__
+features = StudentFeatures.__table__
+
+DEFAULTS = {name: field.default for name, field in PredictionInput.model_fields.items()}
+# Every model feature except days_since_last_login, which depends on "now"
+STORED_FEATURES = [name for name in PredictionInput.model_fields if name != "days_since_last_login"]
+
+def backfill_feature_rows(conn) -> int:
+    """Create default feature rows for students that have none, in one INSERT ... SELECT"""
+    # students.gpa is 0.00 until a real GPA is recorded
+    gpa = func.coalesce(func.nullif(students.c.gpa, 0), DEFAULTS["current_gpa"])
+    missing = select(
+        students.c.id, gpa, gpa, students.c.last_login, literal(datetime.utcnow())
+    ).where(~exists().where(features.c.student_id == students.c.id))
+
+    result = conn.execute(
+        insert(features).from_select(
+            ["student_id", "current_gpa", "previous_gpa", "last_login_at", "updated_at"], missing
+        )
+    )
+    return result.rowcount
+
+def record_attendance(conn, student_id: str, attended: bool) -> int:
+    """Count one class session and recompute attendance_rate in the same UPDATE.
+    Returns the number of rows updated (0 for an unknown student)"""
+    attended = int(attended)
+    return conn.execute(
+        update(features)
+        .where(features.c.student_id == student_id)
+        .values(
+            sessions_attended=features.c.sessions_attended + attended,
+            sessions_total=features.c.sessions_total + 1,
+            attendance_rate=100.0 * (features.c.sessions_attended + attended) / (features.c.sessions_total + 1)
+        )
+    ).rowcount
+
+def record_assignment(conn, student_id: str, completed: bool) -> int:
+    """Count one due assignment and recompute assignment_completion in the same UPDATE.
+    Returns the number of rows updated (0 for an unknown student)"""
+    completed = int(completed)
+    return conn.execute(
+        update(features)
+        .where(features.c.student_id == student_id)
+        .values(
+            assignments_completed=features.c.assignments_completed + completed,
+            assignments_total=features.c.assignments_total + 1,
+            assignment_completion=100.0 * (features.c.assignments_completed + completed) / (features.c.assignments_total + 1)
+        )
+    ).rowcount
+
+def record_login(conn, user_id: str, at: Optional[datetime] = None):
+    """Stamp a student's login on both students and student_features"""
+    at = at or datetime.utcnow()
+    conn.execute(update(students).where(students.c.user_id == user_id).values(last_login=at))
+    conn.execute(
+        update(features)
+        .where(features.c.student_id.in_(select(students.c.id).where(students.c.user_id == user_id)))
+        .values(last_login_at=at)
+    )
+
+def update_features(conn, student_id: str, values: Dict[str, float]) -> int:
+    """Overwrite stored features, e.g. age or financial aid after an advisor edit.
+    Returns the number of matching rows (0 for an unknown student)"""
+    unknown = set(values) - set(STORED_FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown features: {', '.join(sorted(unknown))}")
+    if not values:
+        return conn.execute(select(func.count()).where(features.c.student_id == student_id)).scalar()
+    return conn.execute(update(features).where(features.c.student_id == student_id).values(**values)).rowcount
+
+def load_feature_columns(conn, student_ids: Optional[List[str]] = None, after_id: Optional[str] = None,
+                         limit: Optional[int] = None, now: Optional[datetime] = None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Read feature rows straight into {feature name: float64 column}.
+
+    Select either `student_ids` or a keyset page (`after_id`, `limit`) in
+    primary-key order. Columns are transposed with zip(), so no Python code
+    runs per field; feed them to app.ml.scoring to get model-ordered matrices.
+    """
+    query = select(
+        features.c.student_id,
+        features.c.last_login_at,
+        *[func.coalesce(features.c[name], DEFAULTS[name]) for name in STORED_FEATURES]
+    ).order_by(features.c.student_id)
+    if student_ids is not None:
+        query = query.where(features.c.student_id.in_(student_ids))
+    if after_id is not None:
+        query = query.where(features.c.student_id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    rows = conn.execute(query).all()
+    if not rows:
+        return [], {}
+
+    ids, last_logins, *values = zip(*rows)
+    columns = {name: np.array(column, dtype=np.float64) for name, column in zip(STORED_FEATURES, values)}
+
+    # Whole days since last login; students who never logged in get the default
+    now = np.datetime64(now or datetime.utcnow(), 's')
+    logins = np.array(last_logins, dtype='datetime64[s]')
+    days = (now - logins).astype('timedelta64[D]').astype(np.float64)
+    columns["days_since_last_login"] = np.where(np.isnat(logins), DEFAULTS["days_since_last_login"], days)
+
+    return list(ids), columns
@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from app.ml.compiled_forest import CompiledForest, compile_forest
+
+MODEL_DIR = os.getenv("MODEL_DIR", os.path.dirname(os.path.abspath(__file__)))
+COMPILED_FORESTS = os.getenv("COMPILED_FORESTS", "true").lower() == "true"
+COMPILED_FOREST_FALLBACK_ROWS = int(os.getenv("COMPILED_FOREST_FALLBACK_ROWS", 512))
+# Memory-map fused forests and skip the sklearn pickles so uvicorn workers
+# share one page-cache copy (large batches then use the compiled traversal too)
+MODEL_MMAP = os.getenv("MODEL_MMAP", "false").lower() == "true"
+
+class ModelUnavailable(Exception):
+    """Raised when a model's artifacts are missing or fail to load"""
+
+class ModelBundle:
+    """One loaded version of a model: estimator, optional scaler and feature order.
+
+    `scaler` is None when the estimator is a fused forest taking raw features.
+    """
+
+    def __init__(self, name: str, model, scaler, features: List[str], version: str, loaded_at: datetime):
+        self.name = name
+        self.model = model
+        self.scaler = scaler
+        self.features = features
+        self.version = version
+        self.loaded_at = loaded_at
+
+    def transform(self, X):
+        return X if self.scaler is None else self.scaler.transform(X)
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at.isoformat(),
+            "estimator": type(self.model).__name__,
+            "fused": self.scaler is None
+        }
+
+class ModelRegistry:
+    """Lazily loads model artifacts and swaps in new versions atomically.
+
+    Handlers take a bundle with `get()` and use it for the whole request;
+    `reload()` builds the new bundle completely before replacing the
+    reference, so in-flight requests finish on the version they started with.
+    """
+
+    def __init__(self, model_dir: str, names: List[str]):
+        self.model_dir = model_dir
+        self.names = names
+        self._bundles: Dict[str, ModelBundle] = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._reload_listeners = []
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.model_dir, filename)
+
+    def _artifact_paths(self, name: str) -> List[str]:
+        candidates = [f"{name}_model.pkl", f"{name}_scaler.pkl", f"{name}_features.json"]
+        paths = [self._path(f) for f in candidates if os.path.exists(self._path(f))]
+
+        fused_dir = self._path(f"{name}_model_fused")
+        if os.path.isdir(fused_dir):
+            fused_dir = CompiledForest.resolve(fused_dir)
+            paths.extend(
+                os.path.join(fused_dir, f) for f in sorted(os.listdir(fused_dir))
+                if os.path.isfile(os.path.join(fused_dir, f))
+            )
+        return paths
+
+    def artifact_version(self, name: str) -> str:
+        """File hash plus newest modification time of the model's artifacts"""
+        digest = hashlib.sha256()
+        newest = 0.0
+        for path in self._artifact_paths(name):
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            newest = max(newest, os.path.getmtime(path))
+        return f"{digest.hexdigest()[:12]}-{datetime.utcfromtimestamp(newest).strftime('%Y%m%dT%H%M%S')}"
+
+    def _load(self, name: str) -> ModelBundle:
+        fused_path = self._path(f"{name}_model_fused")
+        if COMPILED_FORESTS and MODEL_MMAP and os.path.isdir(fused_path):
+            return self._load_mapped(name, fused_path)
+
+        # sklearn is only needed for the pickled path; mapped workers never import it
+        import joblib
+        from sklearn.pipeline import make_pipeline
+
+        try:
+            version = self.artifact_version(name)
+            model = joblib.load(self._path(f"{name}_model.pkl"))
+            scaler = joblib.load(self._path(f"{name}_scaler.pkl"))
+            with open(self._path(f"{name}_features.json"), 'r') as f:
+                features = json.load(f)
+        except Exception as exc:
+            raise ModelUnavailable(f"{name} model not loaded: {exc}")
+
+        # Serve small batches through the flattened array forests
+        if COMPILED_FORESTS:
+            try:
+                # Fused artifacts take raw features, so the scaler step is skipped
+                if os.path.isdir(fused_path):
+                    model = CompiledForest.load(
+                        fused_path,
+                        fallback=make_pipeline(scaler, model),
+                        fallback_min_rows=COMPILED_FOREST_FALLBACK_ROWS
+                    )
+                    scaler = None
+                else:
+                    model = compile_forest(model, COMPILED_FOREST_FALLBACK_ROWS)
+            except Exception as exc:
+                raise ModelUnavailable(f"{name} model not loaded: {exc}")
+
+        return ModelBundle(name, model, scaler, features, version, datetime.utcnow())
+
+    def _load_mapped(self, name: str, fused_path: str) -> ModelBundle:
+        try:
+            version = self.artifact_version(name)
+            model = CompiledForest.load(fused_path, mmap=True)
+            with open(self._path(f"{name}_features.json"), 'r') as f:
+                features = json.load(f)
+        except Exception as exc:
+            raise ModelUnavailable(f"{name} model not loaded: {exc}")
+
+        return ModelBundle(name, model, None, features, version, datetime.utcnow())
+
+    def get(self, name: str) -> ModelBundle:
+        bundle = self._bundles.get(name)
+        if bundle is None:
+            with self._lock:
+                bundle = self._bundles.get(name)
+                if bundle is None:
+                    bundle = self._load(name)
+                    self._bundles[name] = bundle
+        return bundle
+
+    def warmup(self):
+        for name in self.names:
+            try:
+                self.get(name)
+            except ModelUnavailable as exc:
+                print(f"⚠️ {exc}. Train models first!")
+
+    def reload(self, name: Optional[str] = None) -> Dict[str, dict]:
+        """Load fresh artifacts and swap them in; returns the versions that changed.
+
+        Every bundle is loaded before any is swapped, so if one model fails
+        to load (ModelUnavailable) the registry keeps serving the old set
+        instead of a mix of versions.
+        """
+        bundles = {model_name: self._load(model_name) for model_name in ([name] if name else self.names)}
+        changed = {}
+        with self._lock:
+            for model_name, bundle in bundles.items():
+                previous = self._bundles.get(model_name)
+                self._bundles[model_name] = bundle
+                if previous is None or previous.version != bundle.version:
+                    changed[model_name] = bundle.describe()
+
+        if changed:
+            for listener in self._reload_listeners:
+                listener()
+        return changed
+
+    def add_reload_listener(self, listener: Callable[[], None]):
+        """Call `listener` after any reload that swapped in a new version"""
+        self._reload_listeners.append(listener)
+
+    def version_key(self) -> Optional[tuple]:
+        """Versions of all models, or None until every model has been loaded"""
+        bundles = [self._bundles.get(name) for name in self.names]
+        if any(bundle is None for bundle in bundles):
+            return None
+        return tuple(bundle.version for bundle in bundles)
+
+    def versions(self) -> Dict[str, Optional[dict]]:
+        return {name: (self._bundles[name].describe() if name in self._bundles else None) for name in self.names}
+
+    async def watch(self, interval: float):
+        """Poll artifact versions and hot-reload any model whose files changed"""
+        while True:
+            await asyncio.sleep(interval)
+            for name in self.names:
+                bundle = self._bundles.get(name)
+                if bundle is None:
+                    continue
+                try:
+                    if await asyncio.to_thread(self.artifact_version, name) != bundle.version:
+                        await asyncio.to_thread(self.reload, name)
+                        print(f"🔄 Reloaded {name} model ({self._bundles[name].version})")
+                except ModelUnavailable as exc:
+                    # Half-written artifacts: keep serving the old version and retry
+                    print(f"⚠️ {exc}")
+
+    def start_watcher(self, interval: float):
+        if interval > 0 and (self._watcher is None or self._watcher.done()):
+            self._watcher = asyncio.get_running_loop().create_task(self.watch(interval))
+
+model_registry = ModelRegistry(MODEL_DIR, ["dropout", "gpa"])
@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import bindparam, func, select, update
+
+from app.database import engine
+from app.models.student import Student
+from app.ml.feature_store import backfill_feature_rows, load_feature_columns
+from app.ml.risk_summary import refresh_risk_summary
+from app.ml.scoring import score_columns
+
+RESCORE_CHUNK_SIZE = int(os.getenv("RESCORE_CHUNK_SIZE", 5000))
+# Anchored to this package rather than the working directory, so every
+# process started from anywhere shares one checkpoint and one lock file
+RESCORE_CHECKPOINT = os.path.abspath(os.getenv(
+    "RESCORE_CHECKPOINT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rescore_checkpoint.json")
+))
+
+students = Student.__table__
+
+# One executemany statement per chunk, matched on the primary key
+update_risk = (
+    update(students)
+    .where(students.c.id == bindparam("student_pk"))
+    .values(risk_score=bindparam("new_risk_score"), risk_level=bindparam("new_risk_level"))
+)
+
+def load_checkpoint(path: str) -> Optional[dict]:
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return None
+
+def save_checkpoint(path: str, state: dict):
+    # Write-then-rename so a crash never leaves a half-written checkpoint
+    staging = f"{path}.tmp"
+    with open(staging, 'w') as f:
+        json.dump(state, f)
+    os.replace(staging, path)
+
+def try_rescore_lock(checkpoint_path: str):
+    """Take the non-blocking lock beside `checkpoint_path`, or return None if
+    another process holds it. The OS drops the lock when its holder exits, so
+    a crashed leader is replaced on another process's next attempt."""
+    lock_file = open(f"{checkpoint_path}.lock", 'a')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+def rescore_students(chunk_size: int = RESCORE_CHUNK_SIZE, checkpoint_path: Optional[str] = RESCORE_CHECKPOINT, resume: bool = False) -> dict:
+    """Stream every student's stored features in primary-key order, score each
+    chunk with one forest call and write risk_score/risk_level back with one
+    executemany.
+
+    Each chunk commits before the checkpoint advances, so a resumed run
+    rescores at most one chunk twice.
+    """
+    state = load_checkpoint(checkpoint_path) if resume else None
+    if state:
+        print(f"↩️ Resuming after student {state['last_id']} ({state['scored']} already scored)")
+    else:
+        state = {"last_id": None, "scored": 0, "started_at": datetime.utcnow().isoformat()}
+
+    with engine.begin() as conn:
+        created = backfill_feature_rows(conn)
+        total = conn.execute(select(func.count()).select_from(students)).scalar()
+    if created:
+        print(f"   Created default feature rows for {created} students")
+
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    scored_this_run = 0
+
+    while True:
+        with engine.begin() as conn:
+            student_ids, columns = load_feature_columns(conn, after_id=state["last_id"], limit=chunk_size, now=now)
+            if not student_ids:
+                break
+
+            scores = score_columns(columns)
+            conn.execute(update_risk, [
+                {"student_pk": student_id, "new_risk_score": risk_score, "new_risk_level": risk_level}
+                for student_id, risk_score, risk_level in zip(student_ids, scores["dropout_risk"].tolist(), scores["risk_level"].tolist())
+            ])
+
+        state["last_id"] = student_ids[-1]
+        state["scored"] += len(student_ids)
+        scored_this_run += len(student_ids)
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state)
+
+        elapsed = time.perf_counter() - started
+        print(f"   {state['scored']}/{total} students scored ({scored_this_run / elapsed:,.0f}/s)")
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    # Every risk level may have moved, so rebuild the dashboard aggregates
+    with engine.begin() as conn:
+        refresh_risk_summary(conn)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Rescored {scored_this_run} students in {elapsed:.1f}s")
+    return {"scored": state["scored"], "seconds": round(elapsed, 2)}
+
+async def run_periodically(interval_minutes: float, chunk_size: int = RESCORE_CHUNK_SIZE,
+                           checkpoint_path: Optional[str] = RESCORE_CHECKPOINT):
+    """Rescore the whole cohort every `interval_minutes`, off the event loop.
+
+    Every uvicorn worker runs this loop, but only the one holding the rescore
+    lock does any work; it keeps the lock for as long as it lives.
+    """
+    lock = None
+    while True:
+        if lock is None:
+            lock = try_rescore_lock(checkpoint_path)
+        if lock is not None:
+            try:
+                await asyncio.to_thread(rescore_students, chunk_size, checkpoint_path, True)
+            except Exception as exc:
+                print(f"⚠️ Rescoring failed: {exc}")
+        await asyncio.sleep(interval_minutes * 60)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore every student's dropout risk")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", default=RESCORE_CHECKPOINT)
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    parser.add_argument("--every", type=float, metavar="MINUTES", help="keep running on this schedule")
+    args = parser.parse_args()
+
+    if args.every:
+        asyncio.run(run_periodically(args.every, args.chunk_size, args.checkpoint))
+    else:
+        lock = try_rescore_lock(args.checkpoint)
+        if lock is None:
+            print(f"❌ Another process is rescoring (lock held on {args.checkpoint}.lock)")
+        else:
+            rescore_students(args.chunk_size, args.checkpoint, args.resume)
@@ -0,0 +1,125 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, case, cast, delete, extract, func, insert, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.risk_summary import RiskSummary
+from app.models.student import Student
+
+students = Student.__table__
+summary = RiskSummary.__table__
+
+GPA_BUCKET_WIDTH = 0.5
+GPA_BUCKETS = 8  # 0.0-0.5 ... 3.5-4.0, with 4.0 itself in the last bucket
+RISK_LEVELS = ["low", "medium", "high"]
+
+def gpa_bucket(gpa) -> int:
+    return min(int(max(gpa or 0.0, 0.0) / GPA_BUCKET_WIDTH), GPA_BUCKETS - 1)
+
+def gpa_bucket_column(gpa):
+    # A CASE ladder rather than CAST(gpa / width): Postgres rounds casts, SQLite truncates
+    gpa = func.coalesce(gpa, 0.0)
+    return case(*[(gpa < GPA_BUCKET_WIDTH * (i + 1), i) for i in range(GPA_BUCKETS - 1)], else_=GPA_BUCKETS - 1)
+
+def refresh_risk_summary(conn) -> int:
+    """Rebuild the whole table with one grouped INSERT ... SELECT.
+
+    On Postgres the table is locked against writers first (readers still
+    get the old rows until commit). A signup that upserted before the lock
+    has committed its student by the time the SELECT runs, and one that
+    upserts after waits for the rebuild and adds itself on top, so under
+    READ COMMITTED no student is counted twice or missed. SQLite already
+    serializes writers.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"LOCK TABLE {summary.name} IN EXCLUSIVE MODE"))
+    cohort = func.coalesce(cast(extract("year", students.c.created_at), Integer), datetime.utcnow().year)
+    bucket = gpa_bucket_column(students.c.gpa)
+    grouped = select(
+        cohort,
+        func.coalesce(students.c.risk_level, "low"),
+        bucket,
+        func.count(),
+        func.coalesce(func.sum(students.c.risk_score), 0),
+        func.coalesce(func.sum(students.c.gpa), 0.0),
+        literal(datetime.utcnow())
+    ).group_by(cohort, func.coalesce(students.c.risk_level, "low"), bucket)
+
+    conn.execute(delete(summary))
+    result = conn.execute(
+        insert(summary).from_select(
+            ["cohort", "risk_level", "gpa_bucket", "student_count", "risk_score_sum", "gpa_sum", "updated_at"], grouped
+        )
+    )
+    return result.rowcount
+
+def ensure_risk_summary(conn) -> int:
+    """Build the table once for databases that predate it"""
+    if conn.execute(select(summary.c.cohort).limit(1)).first() is None:
+        return refresh_risk_summary(conn)
+    return 0
+
+def record_new_student(conn, created_at: datetime, risk_level: str = "low", risk_score: int = 0, gpa: float = 0.0):
+    """Count one new student in its summary row, creating the row if needed"""
+    upsert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[conn.dialect.name]
+    now = datetime.utcnow()
+    statement = upsert(summary).values(
+        cohort=created_at.year, risk_level=risk_level, gpa_bucket=gpa_bucket(gpa),
+        student_count=1, risk_score_sum=risk_score, gpa_sum=gpa, updated_at=now
+    )
+    conn.execute(statement.on_conflict_do_update(
+        index_elements=["cohort", "risk_level", "gpa_bucket"],
+        set_={
+            "student_count": summary.c.student_count + 1,
+            "risk_score_sum": summary.c.risk_score_sum + risk_score,
+            "gpa_sum": summary.c.gpa_sum + gpa,
+            "updated_at": now
+        }
+    ))
+
+def load_risk_summary(conn, cohort: Optional[int] = None) -> dict:
+    """Counts per risk level, average risk score and a GPA histogram"""
+    query = select(
+        summary.c.risk_level, summary.c.gpa_bucket,
+        func.sum(summary.c.student_count), func.sum(summary.c.risk_score_sum),
+        func.sum(summary.c.gpa_sum), func.max(summary.c.updated_at)
+    ).group_by(summary.c.risk_level, summary.c.gpa_bucket)
+    if cohort is not None:
+        query = query.where(summary.c.cohort == cohort)
+
+    levels = {level: {"count": 0, "risk_score_sum": 0} for level in RISK_LEVELS}
+    histogram = [0] * GPA_BUCKETS
+    gpa_total = 0.0
+    updated_at = None
+    for risk_level, bucket, count, risk_score_sum, gpa_sum, row_updated_at in conn.execute(query):
+        level = levels.setdefault(risk_level, {"count": 0, "risk_score_sum": 0})
+        level["count"] += count
+        level["risk_score_sum"] += risk_score_sum
+        histogram[bucket] += count
+        gpa_total += gpa_sum
+        updated_at = max(filter(None, [updated_at, row_updated_at]), default=None)
+
+    total = sum(level["count"] for level in levels.values())
+    score_total = sum(level["risk_score_sum"] for level in levels.values())
+    return {
+        "cohort": cohort,
+        "total_students": total,
+        "avg_risk_score": round(score_total / total, 2) if total else None,
+        "avg_gpa": round(gpa_total / total, 3) if total else None,
+        "risk_levels": {
+            name: {
+                "count": level["count"],
+                "avg_risk_score": round(level["risk_score_sum"] / level["count"], 2) if level["count"] else None
+            }
+            for name, level in levels.items()
+        },
+        "gpa_histogram": [
+            {"min": i * GPA_BUCKET_WIDTH, "max": (i + 1) * GPA_BUCKET_WIDTH, "count": count}
+            for i, count in enumerate(histogram)
+        ],
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+
+def list_cohorts(conn) -> list:
+    return list(conn.execute(select(summary.c.cohort).distinct().order_by(summary.c.cohort)).scalars())
@@ -0,0 +1,34 @@
+import numpy as np
+from typing import Dict
+from app.ml.registry import model_registry
+
+def feature_matrix(features, columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Stack per-feature columns into one (n_rows, n_features) matrix in model order"""
+    return np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in features])
+
+def risk_levels(dropout_risk: np.ndarray) -> np.ndarray:
+    return np.select([dropout_risk > 60, dropout_risk > 30], ["high", "medium"], default="low")
+
+def score_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Run both models once over a batch given as {feature name: column}.
+
+    Returns dropout_probability, dropout_risk (0-100), risk_level and
+    predicted_gpa (clipped to 0-4, not yet rounded) as arrays.
+    """
+    # Pin both versions for the whole batch so a hot reload can't mix them
+    dropout = model_registry.get("dropout")
+    gpa = model_registry.get("gpa")
+
+    # Fused models take raw features and skip the scaler
+    dropout_matrix = dropout.transform(feature_matrix(dropout.features, columns))
+    gpa_matrix = gpa.transform(feature_matrix(gpa.features, columns))
+
+    dropout_prob = dropout.model.predict_proba(dropout_matrix)[:, 1]
+    dropout_risk = (dropout_prob * 100).astype(int)
+
+    return {
+        "dropout_probability": dropout_prob,
+        "dropout_risk": dropout_risk,
+        "risk_level": risk_levels(dropout_risk),
+        "predicted_gpa": np.clip(gpa.model.predict(gpa_matrix), 0, 4.0)
+    }
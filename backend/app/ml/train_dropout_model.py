@@ -6,6 +6,7 @@ from sklearn.metrics import classification_report, confusion_matrix, accuracy_sc
 from sklearn.preprocessing import StandardScaler
 import joblib
 import json
+from export_fused_model import export_fused_model
 
 def train_dropout_model():
     print("=" * 50)
@@ -101,6 +102,9 @@ def train_dropout_model():
     print("✅ Scaler saved as 'dropout_scaler.pkl'")
     print("✅ Features saved as 'dropout_features.json'")
     
+    # Export scaler-free artifact for serving
+    export_fused_model(model, scaler, X, 'dropout_model_fused')
+    
     # Test with sample prediction
     print("\n8. Testing with sample student...")
     sample_student = X_test.iloc[0:1]
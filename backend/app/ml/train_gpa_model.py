@@ -6,6 +6,7 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler
 import joblib
 import json
+from export_fused_model import export_fused_model
 
 def train_gpa_model():
     print("=" * 50)
@@ -91,6 +92,9 @@ def train_gpa_model():
     print("✅ Model saved as 'gpa_model.pkl'")
     print("✅ Scaler saved as 'gpa_scaler.pkl'")
     
+    # Export scaler-free artifact for serving
+    export_fused_model(model, scaler, X, 'gpa_model_fused')
+    
     # Test prediction
     print("\n6. Testing with sample student...")
     sample = X_test.iloc[0:1]
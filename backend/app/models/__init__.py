@@ -1,2 +1,4 @@
 from .user import User
-from .student import Student
\ No newline at end of file
+from .student import Student
+from .student_features import StudentFeatures
+from .risk_summary import RiskSummary
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Integer, Float
+from app.database import Base
+from datetime import datetime
+
+class RiskSummary(Base):
+    __tablename__ = "risk_summary"
+
+    # One row per cohort (enrollment year), risk level and GPA bucket, so a
+    # dashboard reads a few dozen rows whatever the roster size
+    cohort = Column(Integer, primary_key=True)
+    risk_level = Column(String, primary_key=True)
+    gpa_bucket = Column(Integer, primary_key=True)
+
+    student_count = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(Integer, nullable=False, default=0)
+    gpa_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
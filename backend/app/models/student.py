@@ -1,18 +1,28 @@
-from sqlalchemy import Column, String, DateTime, Integer, Float, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Float, ForeignKey, Index, func, literal_column
 from app.database import Base
 import uuid
 from datetime import datetime
 
 class Student(Base):
     __tablename__ = "students"
-
     # Use String for SQLite
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'))
+    user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), index=True)
     student_id = Column(String, unique=True, nullable=False)
     gpa = Column(Float, default=0.00)
     risk_score = Column(Integer, default=0)
     risk_level = Column(String, default='low')
     last_login = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Sort keys for keyset pages of /api/students/all. Both columns are nullable
+# and a row comparison never matches NULL, so NULLs sort as 0; the literal
+# defaults keep the query expressions identical to the indexed ones
+RISK_SCORE_KEY = func.coalesce(Student.risk_score, literal_column("0"))
+GPA_KEY = func.coalesce(Student.gpa, literal_column("0.0"))
+
+# Highest risk first, optionally for a single risk level, or by GPA
+Index("ix_students_risk_score_key_id", RISK_SCORE_KEY, Student.id)
+Index("ix_students_risk_level_score_key_id", Student.risk_level, RISK_SCORE_KEY, Student.id)
+Index("ix_students_gpa_key_id", GPA_KEY, Student.id)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, DateTime, Integer, Float, ForeignKey
+from app.database import Base
+from datetime import datetime
+
+class StudentFeatures(Base):
+    __tablename__ = "student_features"
+
+    # One row per student, keyed on students.id
+    student_id = Column(String, ForeignKey('students.id', ondelete='CASCADE'), primary_key=True)
+
+    # Model features (see app/ml/*_features.json)
+    age = Column(Integer, default=20)
+    previous_gpa = Column(Float, default=3.0)
+    current_gpa = Column(Float, default=3.0)
+    attendance_rate = Column(Float, default=85.0)
+    assignment_completion = Column(Float, default=80.0)
+    study_hours_per_week = Column(Integer, default=15)
+    forum_posts = Column(Integer, default=10)
+    financial_aid = Column(Integer, default=0)
+    part_time_job = Column(Integer, default=0)
+    commute_time = Column(Integer, default=30)
+    # days_since_last_login is derived from this at load time
+    last_login_at = Column(DateTime)
+
+    # Running counters behind the rates, updated in place
+    sessions_attended = Column(Integer, default=0)
+    sessions_total = Column(Integer, default=0)
+    assignments_completed = Column(Integer, default=0)
+    assignments_total = Column(Integer, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
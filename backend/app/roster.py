@@ -0,0 +1,208 @@
+import argparse
+import csv
+import io
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.auth import get_password_hash
+from app.database import engine
+from app.ml.risk_summary import refresh_risk_summary
+from app.models.student import Student
+from app.models.student_features import StudentFeatures
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+ROSTER_CHUNK_SIZE = int(os.getenv("ROSTER_CHUNK_SIZE", 1000))
+# bcrypt releases the GIL, so plain threads hash on every core (CLI imports;
+# the API passes a hasher on the shared password pool instead)
+ROSTER_HASH_WORKERS = int(os.getenv("ROSTER_HASH_WORKERS", os.cpu_count() or 1))
+USER_TYPES = ("student", "advisor")
+
+users = User.__table__
+students = Student.__table__
+features = StudentFeatures.__table__
+
+def roster_format(filename: str) -> str:
+    return "ndjson" if filename.lower().endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+def read_roster(stream: BinaryIO, fmt: str = "csv") -> Iterator[Tuple[int, object]]:
+    """Yield (line number, raw row) from a CSV or NDJSON roster without
+    reading the whole file into memory.
+
+    Rows that can't be parsed are yielded as the exception, so the caller
+    reports them alongside validation errors instead of aborting.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, ValueError(f"Invalid JSON: {exc.msg}")
+    else:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+
+def validate_row(row) -> dict:
+    """Check one roster row against the signup schema; raises ValueError"""
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("Expected an object per line")
+
+    row = {key.strip().lower(): value.strip() if isinstance(value, str) else value
+           for key, value in row.items() if key}
+    row["user_type"] = row.get("user_type") or "student"
+    try:
+        user = UserCreate(**row)
+    except ValidationError as exc:
+        raise ValueError("; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()))
+    if user.user_type not in USER_TYPES:
+        raise ValueError(f"user_type must be one of {', '.join(USER_TYPES)}")
+    if not user.password:
+        raise ValueError("password: must not be empty")
+
+    student_code = row.get("student_id") or None
+    if student_code and user.user_type != "student":
+        raise ValueError("student_id is only valid for students")
+    return {"email": user.email, "name": user.name, "user_type": user.user_type,
+            "password": user.password, "student_code": student_code}
+
+def import_chunk(rows: List[Tuple[int, dict]], hash_passwords: Callable[[List[str]], List[str]],
+                 errors: List[dict]) -> int:
+    """Insert one chunk of validated rows in a single transaction.
+
+    Existing emails and student IDs are found with one IN query each;
+    passwords are hashed in parallel before the transaction opens, so no
+    connection is held while bcrypt runs. Hashes are kept on the rows, so
+    a retry after a conflict doesn't hash them again.
+    """
+    emails = [row["email"] for _, row in rows]
+    codes = [row["student_code"] for _, row in rows if row["student_code"]]
+    with engine.connect() as conn:
+        taken_emails = set(conn.execute(select(users.c.email).where(users.c.email.in_(emails))).scalars())
+        taken_codes = set(conn.execute(
+            select(students.c.student_id).where(students.c.student_id.in_(codes))
+        ).scalars()) if codes else set()
+
+    accepted = []
+    for line_number, row in rows:
+        if row["email"] in taken_emails:
+            errors.append({"row": line_number, "email": row["email"], "error": "Email already registered"})
+        elif row["student_code"] in taken_codes:
+            errors.append({"row": line_number, "email": row["email"], "error": "student_id already in use"})
+        else:
+            accepted.append((line_number, row))
+    if not accepted:
+        return 0
+
+    unhashed = [row for _, row in accepted if "password_hash" not in row]
+    for row, password_hash in zip(unhashed, hash_passwords([row["password"] for row in unhashed])):
+        row["password_hash"] = password_hash
+    now = datetime.utcnow()
+    user_rows, student_rows, feature_rows = [], [], []
+    for _, row in accepted:
+        user_id = str(uuid.uuid4())
+        user_rows.append({"id": user_id, "email": row["email"], "name": row["name"], "password_hash": row["password_hash"],
+                          "user_type": row["user_type"], "created_at": now, "updated_at": now})
+        if row["user_type"] == "student":
+            student_pk = str(uuid.uuid4())
+            student_rows.append({"id": student_pk, "user_id": user_id, "created_at": now, "updated_at": now,
+                                 "student_id": row["student_code"] or f"STU{str(uuid.uuid4())[:8].upper()}"})
+            feature_rows.append({"student_id": student_pk, "updated_at": now})
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(users), user_rows)
+            if student_rows:
+                conn.execute(insert(students), student_rows)
+                conn.execute(insert(features), feature_rows)
+    except IntegrityError:
+        # A signup or another import claimed a key after our check; the
+        # chunk rolled back as a whole, so retry its rows one by one
+        if len(accepted) == 1:
+            line_number, row = accepted[0]
+            errors.append({"row": line_number, "email": row["email"], "error": "Email or student_id already in use"})
+            return 0
+        return sum(import_chunk([item], hash_passwords, errors) for item in accepted)
+    return len(user_rows)
+
+def import_roster(stream: BinaryIO, fmt: str = "csv", chunk_size: int = ROSTER_CHUNK_SIZE,
+                  hash_workers: int = ROSTER_HASH_WORKERS,
+                  hash_password: Callable[[str], str] = get_password_hash,
+                  hash_passwords: Optional[Callable[[List[str]], List[str]]] = None) -> dict:
+    """Create users (and student + feature rows) from a CSV or NDJSON roster.
+
+    Columns: email, name, password, optional user_type (default student) and
+    student_id. Bad or duplicate rows are reported by line number and
+    skipped; every other row is imported, one transaction per chunk.
+    `hash_passwords` hashes a list of passwords; without it, `hash_password`
+    runs on a pool of `hash_workers` threads owned by this import.
+    """
+    started = time.perf_counter()
+    created = 0
+    errors: List[dict] = []
+    seen = set()
+    rows = read_roster(stream, fmt)
+
+    with ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="roster-bcrypt") as hasher:
+        hash_passwords = hash_passwords or (lambda passwords: list(hasher.map(hash_password, passwords)))
+        while raw_chunk := list(islice(rows, chunk_size)):
+            chunk = []
+            for line_number, raw in raw_chunk:
+                try:
+                    row = validate_row(raw)
+                except ValueError as exc:
+                    email = raw.get("email") if isinstance(raw, dict) else None
+                    errors.append({"row": line_number, "email": email, "error": str(exc)})
+                    continue
+                # Duplicates within the file never reach the database
+                if row["email"] in seen or row["student_code"] in seen:
+                    errors.append({"row": line_number, "email": row["email"], "error": "Duplicate row in roster"})
+                    continue
+                seen.add(row["email"])
+                if row["student_code"]:
+                    seen.add(row["student_code"])
+                chunk.append((line_number, row))
+            if chunk:
+                created += import_chunk(chunk, hash_passwords, errors)
+
+    # One grouped rebuild is cheaper than upserting the aggregates per row
+    if created:
+        with engine.begin() as conn:
+            refresh_risk_summary(conn)
+
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "created": created,
+        "failed": len(errors),
+        "errors": errors,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-create accounts from a CSV or NDJSON roster")
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=ROSTER_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=ROSTER_HASH_WORKERS, help="bcrypt threads")
+    args = parser.parse_args()
+
+    with open(args.file, "rb") as f:
+        result = import_roster(f, args.format or roster_format(args.file), args.chunk_size, args.workers)
+    for error in result["errors"]:
+        print(f"   line {error['row']}: {error['email'] or '-'}: {error['error']}")
+    print(f"✅ Created {result['created']} accounts, {result['failed']} rows failed ({result['seconds']}s)")
@@ -1,28 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.user import User
 from app.models.student import Student
+from app.models.student_features import StudentFeatures
+from app.ml.feature_store import record_login
+from app.ml.risk_summary import record_new_student
 from app.schemas.user import UserCreate, UserLogin, Token
+from app.roster import import_roster, roster_format
 from app.auth import get_password_hash, verify_password, create_access_token
+from app.cache import TTLCache
 from datetime import timedelta
+import asyncio
+import os
 import uuid
-from app.auth import get_password_hash, verify_password, create_access_token, get_current_user
+from app.auth import (
+    get_password_hash, verify_password, create_access_token, get_current_user,
+    get_password_hash_async, verify_password_async, password_batch_hasher, password_executor
+)
 
 router = APIRouter()
 
+# /me is polled on every page load; a renamed user shows up within the TTL
+user_cache = TTLCache(
+    max_size=int(os.getenv("USER_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("USER_CACHE_TTL", 30))
+)
+
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # Give the connection back to the pool while bcrypt runs, so a signup
+    # burst can't exhaust it and stall the event loop waiting for one
+    await db.rollback()
+    
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         name=user_data.name,
@@ -31,8 +53,15 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent signup took the email after our check
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # If student, create student record
     if user_data.user_type == "student":
@@ -41,25 +70,44 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
             student_id=f"STU{str(uuid.uuid4())[:8].upper()}"
         )
         db.add(student_record)
-        db.commit()
+        await db.flush()
+        
+        # Start the student's feature row with model defaults
+        db.add(StudentFeatures(student_id=student_record.id))
+        await db.run_sync(lambda session: record_new_student(session.connection(), student_record.created_at))
+        await db.commit()
     
     return {"message": "User created successfully", "email": new_user.email}
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     # Find user
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
+    
+    # Detach the user and give the connection back to the pool while bcrypt
+    # runs; the detached instance keeps its loaded attributes
+    if user:
+        db.expunge(user)
+    await db.rollback()
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Claims carry the ids /me-style endpoints need to go straight to primary
+    # keys; tokens are only signed, so names stay out of them
+    claims = {"sub": user.email, "user_type": user.user_type, "user_id": str(user.id)}
+    
+    # Keep last-login features current for scoring
+    if user.user_type == "student":
+        await db.run_sync(lambda session: record_login(session.connection(), user.id))
+        claims["student_pk"] = await db.scalar(select(Student.id).where(Student.user_id == user.id))
+        await db.commit()
+    
     # Create access token
-    access_token = create_access_token(
-        data={"sub": user.email, "user_type": user.user_type, "user_id": str(user.id)}
-    )
+    access_token = create_access_token(data=claims)
     
     return {
         "access_token": access_token,
@@ -71,15 +119,44 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 @router.get("/me")
 async def get_current_user_info(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == current_user["sub"]).first()
-    if not user:
+    user_id = current_user.get("user_id")
+    profile = user_cache.get(user_id) if user_id else None
+    if profile is not None:
+        return profile
+    
+    row = (await db.execute(
+        select(User.id, User.email, User.name, User.user_type).where(User.id == user_id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return {
-        "id": str(user.id),
-        "email": user.email,
-        "name": user.name,
-        "user_type": user.user_type
-    }
\ No newline at end of file
+    profile = {"id": str(row.id), "email": row.email, "name": row.name, "user_type": row.user_type}
+    user_cache.set(user_id, profile)
+    return profile
+
+@router.get("/stats")
+async def auth_stats(current_user: dict = Depends(get_current_user)):
+    # Only advisors can see hashing pool metrics
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    return {"password_hashing": password_executor.stats()}
+
+@router.post("/import")
+async def import_accounts(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    # Only advisors can onboard a roster
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Chunked inserts block, so the whole import runs off the event loop;
+    # bcrypt shares the login pool. Bad rows come back in "errors" by line number
+    fmt = roster_format(file.filename or "")
+    if file.content_type in ("application/x-ndjson", "application/jsonl"):
+        fmt = "ndjson"
+    hash_passwords = password_batch_hasher(asyncio.get_running_loop())
+    return await asyncio.to_thread(import_roster, file.file, fmt, hash_passwords=hash_passwords)
@@ -1,129 +1,316 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.student import Student
 from app.auth import get_current_user
-import joblib
+from app.cache import SQLiteCache, TieredCache, TTLCache
+from app.ml.assignment_feedback import (
+    SENTIMENT_BATCH_SIZE, SUBMISSION_EXTENSIONS, SentimentAverage, TextStats, analyze_assignments, analyzer_version,
+    assignment_report, grade_files, nlp_enabled, normalize_text, sentiment_scores, sentiment_status, warmup_sentiment
+)
+from app.ml.batcher import MicroBatcher
+from app.ml.executor import InferenceExecutor, InferenceQueueFull
+from app.ml.registry import ModelUnavailable, model_registry
+from app.ml.feature_store import load_feature_columns
+from app.ml.scoring import score_columns
+from app.schemas.prediction import PredictionInput, PredictionResponse
+import asyncio
+import codecs
+import hashlib
 import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pydantic import BaseModel
 from typing import List
 
 router = APIRouter()
 
-# Load models
-try:
-    dropout_model = joblib.load('app/ml/dropout_model.pkl')
-    dropout_scaler = joblib.load('app/ml/dropout_scaler.pkl')
-    with open('app/ml/dropout_features.json', 'r') as f:
-        dropout_features = json.load(f)
-    
-    gpa_model = joblib.load('app/ml/gpa_model.pkl')
-    gpa_scaler = joblib.load('app/ml/gpa_scaler.pkl')
-    with open('app/ml/gpa_features.json', 'r') as f:
-        gpa_features = json.load(f)
-    
-    models_loaded = True
-except:
-    models_loaded = False
-    print("⚠️ ML models not loaded. Train models first!")
-
-class PredictionInput(BaseModel):
-    age: int = 20
-    previous_gpa: float = 3.0
-    current_gpa: float = 3.0
-    attendance_rate: float = 85.0
-    assignment_completion: float = 80.0
-    study_hours_per_week: int = 15
-    forum_posts: int = 10
-    days_since_last_login: int = 2
-    financial_aid: int = 0
-    part_time_job: int = 0
-    commute_time: int = 30
-
-class PredictionResponse(BaseModel):
-    dropout_risk: int
-    dropout_probability: float
-    predicted_gpa: float
-    risk_level: str
-    recommendations: List[str]
+# Uploaded assignments are read and analyzed this many bytes at a time
+UPLOAD_READ_SIZE = 64 * 1024
+ASSIGNMENT_UPLOAD_LIMIT = int(os.getenv("ASSIGNMENT_UPLOAD_LIMIT_MB", 10)) * 1024 * 1024
+
+# Bulk grading jobs share one process pool of this size for text metrics;
+# past BULK_GRADING_MAX_JOBS running jobs, new ones get a 503. Jobs live in
+# a plain dict (per API worker) and are dropped an hour after they finish
+BULK_GRADING_WORKERS = int(os.getenv("BULK_GRADING_WORKERS", min(4, os.cpu_count() or 1)))
+BULK_GRADING_MAX_JOBS = int(os.getenv("BULK_GRADING_MAX_JOBS", 2))
+BULK_GRADING_UPLOAD_LIMIT = int(os.getenv("BULK_GRADING_UPLOAD_LIMIT_MB", 200)) * 1024 * 1024
+GRADING_JOB_TTL = 3600
+grading_jobs = {}
+grading_pool = None
+grading_pool_lock = threading.Lock()
+
+# Cap on rows per /predict-batch call
+PREDICTION_BATCH_LIMIT = int(os.getenv("PREDICTION_BATCH_LIMIT", 5000))
+
+# Recommendation rules as (feature, op, threshold, message), evaluated
+# column-wise over a whole batch
+RECOMMENDATION_RULES = [
+    ("attendance_rate", "<", 70, "⚠️ Improve attendance - aim for at least 85%"),
+    ("assignment_completion", "<", 70, "📝 Complete more assignments on time"),
+    ("days_since_last_login", ">", 5, "🔔 Log in more frequently to stay engaged"),
+    ("study_hours_per_week", "<", 12, "📚 Increase study time - aim for 15+ hours/week"),
+]
+GPA_DECLINE_MESSAGE = "📉 Your performance may decline - seek help early"
+NO_ISSUES_MESSAGE = "✅ Keep up the good work!"
+
+def score_batch(rows: List[PredictionInput]) -> List[dict]:
+    """Score many inputs with one scaler/forest call per model"""
+    columns = {
+        name: np.array([getattr(row, name) for row in rows], dtype=np.float64)
+        for name in PredictionInput.model_fields
+    }
+    return score_feature_columns(columns)
+
+def score_feature_columns(columns: dict) -> List[dict]:
+    """PredictionResponse rows for a batch given as {feature name: column}"""
+    scores = score_columns(columns)
+    dropout_prob = scores["dropout_probability"]
+    dropout_risk = scores["dropout_risk"]
+    risk_level = scores["risk_level"]
+    predicted_gpa = [round(float(gpa), 2) for gpa in scores["predicted_gpa"]]
+
+    # Evaluate every recommendation rule over the whole batch at once
+    rule_masks = []
+    for feature, op, threshold, message in RECOMMENDATION_RULES:
+        column = columns[feature]
+        mask = column < threshold if op == "<" else column > threshold
+        rule_masks.append((mask, message))
+    rule_masks.append((np.asarray(predicted_gpa) < columns["current_gpa"], GPA_DECLINE_MESSAGE))
+
+    results = []
+    for i in range(len(dropout_risk)):
+        recommendations = [message for mask, message in rule_masks if mask[i]]
+        if not recommendations:
+            recommendations.append(NO_ISSUES_MESSAGE)
+
+        results.append({
+            "dropout_risk": int(dropout_risk[i]),
+            "dropout_probability": round(dropout_prob[i], 3),
+            "predicted_gpa": predicted_gpa[i],
+            "risk_level": str(risk_level[i]),
+            "recommendations": recommendations
+        })
+
+    return results
+
+# Run sklearn off the event loop; NumPy releases the GIL in its inner loops
+inference_executor = InferenceExecutor(
+    "inference",
+    max_workers=int(os.getenv("INFERENCE_THREADS", min(4, os.cpu_count() or 1))),
+    queue_limit=int(os.getenv("INFERENCE_QUEUE_LIMIT", 64))
+)
+
+# DistilBERT gets its own pool; NLP_PROCESS_WORKERS > 0 switches it to
+# processes, each of which loads and warms its own pipeline as it starts
+nlp_process_workers = int(os.getenv("NLP_PROCESS_WORKERS", 0))
+nlp_executor = InferenceExecutor(
+    "nlp",
+    max_workers=nlp_process_workers or int(os.getenv("NLP_THREADS", 1)),
+    queue_limit=int(os.getenv("NLP_QUEUE_LIMIT", 16)),
+    processes=nlp_process_workers > 0,
+    initializer=warmup_sentiment if nlp_process_workers > 0 else None
+)
+
+# Last status reported by a pool worker; in thread mode the pipeline lives
+# in this process and sentiment_status() is read directly
+nlp_worker_status = None
+
+async def warmup_nlp():
+    """Load the sentiment pipeline and run one dummy inference before traffic"""
+    global nlp_worker_status
+    if nlp_enabled():
+        nlp_worker_status = await nlp_executor.run(warmup_sentiment)
+
+def nlp_status() -> dict:
+    if not nlp_enabled():
+        return {"state": "disabled"}
+    if nlp_executor.processes:
+        return nlp_worker_status or {"state": "not_loaded"}
+    return sentiment_status()
+
+async def run_inference(executor: InferenceExecutor, fn, *args):
+    try:
+        return await executor.run(fn, *args)
+    except InferenceQueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except ModelUnavailable:
+        raise HTTPException(status_code=503, detail="ML models not available")
+
+# Coalesce concurrent /predict calls into one forest call per window
+PREDICTION_BATCHING = os.getenv("PREDICTION_BATCHING", "true").lower() == "true"
+prediction_batcher = MicroBatcher(
+    score_batch,
+    max_batch_size=int(os.getenv("PREDICTION_BATCH_MAX_SIZE", 64)),
+    max_wait_ms=float(os.getenv("PREDICTION_BATCH_MAX_WAIT_MS", 2)),
+    executor=inference_executor,
+    queue_limit=int(os.getenv("PREDICTION_BATCH_QUEUE_LIMIT", 1024))
+)
+
+# Queue concurrent /analyze-assignment calls into padded DistilBERT batches;
+# with NLP_PROCESS_WORKERS=N up to N batches run at once
+NLP_BATCHING = os.getenv("NLP_BATCHING", "true").lower() == "true"
+nlp_batcher = MicroBatcher(
+    analyze_assignments,
+    max_batch_size=int(os.getenv("NLP_BATCH_MAX_SIZE", 16)),
+    max_wait_ms=float(os.getenv("NLP_BATCH_MAX_WAIT_MS", 10)),
+    executor=nlp_executor,
+    queue_limit=int(os.getenv("NLP_BATCH_QUEUE_LIMIT", 64))
+)
+
+# Dashboards re-poll identical inputs; entries are keyed on model versions
+# and dropped whenever a model is reloaded
+prediction_cache = TTLCache(
+    max_size=int(os.getenv("PREDICTION_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("PREDICTION_CACHE_TTL", 30))
+)
+model_registry.add_reload_listener(prediction_cache.clear)
+
+# Resubmitted drafts and re-opened submissions skip the transformer. Keys are
+# a BLAKE2 hash of the analyzer version plus the normalized text (or the raw
+# bytes of an upload); ANALYSIS_CACHE_DB adds a SQLite tier that survives restarts
+ANALYSIS_CACHE_DB = os.getenv("ANALYSIS_CACHE_DB")
+analysis_cache = TieredCache(
+    TTLCache(
+        max_size=int(os.getenv("ANALYSIS_CACHE_SIZE", 1000)),
+        ttl=float(os.getenv("ANALYSIS_CACHE_TTL", 86400))
+    ),
+    SQLiteCache(
+        ANALYSIS_CACHE_DB,
+        int(os.getenv("ANALYSIS_CACHE_DB_MAX_ENTRIES", 100000)),
+        touch_interval=float(os.getenv("ANALYSIS_CACHE_DB_TOUCH_SECONDS", 3600))
+    ) if ANALYSIS_CACHE_DB else None
+)
+
+def analysis_hasher(kind: str):
+    """BLAKE2 hasher primed with the analyzer version; None while results
+    would only carry the neutral sentiment fallback"""
+    if nlp_status().get("state") != "ready":
+        return None
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{analyzer_version()}\0{kind}\0".encode())
+    return hasher
+
+def prediction_cache_key(data: PredictionInput):
+    versions = model_registry.version_key()
+    if versions is None:
+        return None
+    return (versions, tuple(getattr(data, name) for name in PredictionInput.model_fields))
 
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_student_outcome(
     data: PredictionInput,
     current_user: dict = Depends(get_current_user)
 ):
-    if not models_loaded:
-        raise HTTPException(status_code=503, detail="ML models not available")
+    cache_key = prediction_cache_key(data)
+    if cache_key is not None:
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            return cached
     
-    # Prepare dropout prediction data
-    dropout_input = [
-        data.age,
-        data.previous_gpa,
-        data.current_gpa,
-        data.attendance_rate,
-        data.assignment_completion,
-        data.study_hours_per_week,
-        data.forum_posts,
-        data.days_since_last_login,
-        data.financial_aid,
-        data.part_time_job,
-        data.commute_time
-    ]
-    
-    # Prepare GPA prediction data
-    gpa_input = [
-        data.age,
-        data.previous_gpa,
-        data.current_gpa,
-        data.attendance_rate,
-        data.assignment_completion,
-        data.study_hours_per_week,
-        data.forum_posts,
-        data.days_since_last_login
-    ]
-    
-    # Make predictions
-    dropout_input_scaled = dropout_scaler.transform([dropout_input])
-    dropout_prob = dropout_model.predict_proba(dropout_input_scaled)[0][1]
-    dropout_risk = int(dropout_prob * 100)
-    
-    gpa_input_scaled = gpa_scaler.transform([gpa_input])
-    predicted_gpa = float(gpa_model.predict(gpa_input_scaled)[0])
-    predicted_gpa = round(max(0, min(4.0, predicted_gpa)), 2)
-    
-    # Determine risk level
-    if dropout_risk > 60:
-        risk_level = "high"
-    elif dropout_risk > 30:
-        risk_level = "medium"
+    if PREDICTION_BATCHING:
+        try:
+            result = await prediction_batcher.submit(data)
+        except InferenceQueueFull as exc:
+            raise HTTPException(status_code=503, detail=str(exc))
+        except ModelUnavailable:
+            raise HTTPException(status_code=503, detail="ML models not available")
     else:
-        risk_level = "low"
-    
-    # Generate recommendations
-    recommendations = []
-    if data.attendance_rate < 70:
-        recommendations.append("⚠️ Improve attendance - aim for at least 85%")
-    if data.assignment_completion < 70:
-        recommendations.append("📝 Complete more assignments on time")
-    if data.days_since_last_login > 5:
-        recommendations.append("🔔 Log in more frequently to stay engaged")
-    if data.study_hours_per_week < 12:
-        recommendations.append("📚 Increase study time - aim for 15+ hours/week")
-    if predicted_gpa < data.current_gpa:
-        recommendations.append("📉 Your performance may decline - seek help early")
-    
-    if not recommendations:
-        recommendations.append("✅ Keep up the good work!")
+        result = (await run_inference(inference_executor, score_batch, [data]))[0]
+    
+    if cache_key is not None:
+        prediction_cache.set(cache_key, result)
+    return result
+
+@router.post("/predict-batch", response_model=List[PredictionResponse])
+async def predict_batch(
+    data: List[PredictionInput],
+    current_user: dict = Depends(get_current_user)
+):
+    if len(data) > PREDICTION_BATCH_LIMIT:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(data)} rows (limit {PREDICTION_BATCH_LIMIT})"
+        )
+    
+    if not data:
+        return []
+    
+    # Only score the rows that aren't cached
+    cache_keys = [prediction_cache_key(row) for row in data]
+    results = [prediction_cache.get(key) if key is not None else None for key in cache_keys]
+    missing = [i for i, result in enumerate(results) if result is None]
     
+    if missing:
+        scored = await run_inference(inference_executor, score_batch, [data[i] for i in missing])
+        for i, result in zip(missing, scored):
+            results[i] = result
+            if cache_keys[i] is not None:
+                prediction_cache.set(cache_keys[i], result)
+    
+    return results
+
+@router.post("/predict/{student_id}", response_model=PredictionResponse)
+async def predict_stored_student(
+    student_id: str,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Advisors can score anyone; students only themselves
+    if current_user.get("user_type") != "advisor" and current_user.get("student_pk") != student_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Features come from the student_features table instead of the request
+    student_ids, columns = await db.run_sync(
+        lambda session: load_feature_columns(session.connection(), student_ids=[student_id])
+    )
+    if not student_ids:
+        raise HTTPException(status_code=404, detail="Student features not found")
+    
+    results = await run_inference(inference_executor, score_feature_columns, columns)
+    return results[0]
+
+@router.get("/stats")
+async def prediction_stats(current_user: dict = Depends(get_current_user)):
     return {
-        "dropout_risk": dropout_risk,
-        "dropout_probability": round(dropout_prob, 3),
-        "predicted_gpa": predicted_gpa,
-        "risk_level": risk_level,
-        "recommendations": recommendations
+        "batching_enabled": PREDICTION_BATCHING,
+        "batcher": prediction_batcher.stats(),
+        "nlp_batching_enabled": NLP_BATCHING,
+        "nlp_batcher": nlp_batcher.stats(),
+        "nlp": nlp_status(),
+        "analysis_cache": analysis_cache.stats(),
+        "cache": prediction_cache.stats(),
+        "executors": {
+            "inference": inference_executor.stats(),
+            "nlp": nlp_executor.stats()
+        }
     }
 
+@router.get("/models")
+async def get_model_versions(current_user: dict = Depends(get_current_user)):
+    return model_registry.versions()
+
+@router.post("/models/reload")
+async def reload_models(current_user: dict = Depends(get_current_user)):
+    # Only advisors can swap models
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    try:
+        changed = await asyncio.to_thread(model_registry.reload)
+    except ModelUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    
+    return {"reloaded": changed, "versions": model_registry.versions()}
+
 class AssignmentText(BaseModel):
     text: str
 
@@ -132,7 +319,249 @@ async def analyze_assignment_endpoint(
     assignment: AssignmentText,
     current_user: dict = Depends(get_current_user)
 ):
-    from app.ml.assignment_feedback import analyze_assignment
+    if not nlp_enabled():
+        raise HTTPException(status_code=503, detail="Assignment feedback is disabled on this server")
+    
+    text = normalize_text(assignment.text)
+    hasher = analysis_hasher("text")
+    cache_key = None
+    if hasher is not None:
+        hasher.update(text.encode())
+        cache_key = hasher.hexdigest()
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    if NLP_BATCHING:
+        try:
+            result = await nlp_batcher.submit(text)
+        except InferenceQueueFull as exc:
+            raise HTTPException(status_code=503, detail=str(exc))
+    else:
+        result = (await run_inference(nlp_executor, analyze_assignments, [text]))[0]
+    
+    if cache_key is not None:
+        analysis_cache.set(cache_key, result)
+    return result
+
+@router.post("/analyze-assignment/file")
+async def analyze_assignment_file(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    if not nlp_enabled():
+        raise HTTPException(status_code=503, detail="Assignment feedback is disabled on this server")
+    
+    # Hash the upload first (it is already spooled by the server), so a
+    # repeated file is answered without analyzing it again
+    hasher = analysis_hasher("file")
+    size = 0
+    while True:
+        block = await file.read(UPLOAD_READ_SIZE)
+        if not block:
+            break
+        size += len(block)
+        if size > ASSIGNMENT_UPLOAD_LIMIT:
+            raise HTTPException(status_code=413, detail=f"File too large (limit {ASSIGNMENT_UPLOAD_LIMIT // (1024 * 1024)} MB)")
+        if hasher is not None:
+            hasher.update(block)
+    
+    cache_key = hasher.hexdigest() if hasher is not None else None
+    if cache_key is not None:
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            return {"filename": file.filename, **cached}
+    await file.seek(0)
+    
+    # Stream the upload through TextStats block by block; sentiment chunks
+    # are scored on the NLP executor a batch at a time, so memory stays
+    # bounded by one block plus one batch however long the essay is
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stats = TextStats()
+    sentiment = SentimentAverage()
+    pending = []
+    
+    while True:
+        block = await file.read(UPLOAD_READ_SIZE)
+        pending.extend(stats.feed(decoder.decode(block, final=not block)))
+        if not block:
+            break
+        if len(pending) >= SENTIMENT_BATCH_SIZE:
+            sentiment.add(pending, await run_inference(nlp_executor, sentiment_scores, pending))
+            pending = []
+    
+    pending.extend(stats.close())
+    if pending and stats.stripped_length >= 50:
+        sentiment.add(pending, await run_inference(nlp_executor, sentiment_scores, pending))
+    
+    result = assignment_report(stats, sentiment.score())
+    if cache_key is not None:
+        analysis_cache.set(cache_key, result)
+    return {"filename": file.filename, **result}
+
+def get_grading_pool() -> ProcessPoolExecutor:
+    # Spawned rather than forked: the API process has live threads (executors,
+    # aiosqlite), and the workers only need the pure-Python text metrics
+    global grading_pool
+    with grading_pool_lock:
+        if grading_pool is None:
+            grading_pool = ProcessPoolExecutor(
+                max_workers=BULK_GRADING_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return grading_pool
+
+def running_grading_jobs() -> int:
+    return sum(1 for job in grading_jobs.values() if job["status"] == "running")
+
+def prune_grading_jobs():
+    """Forget jobs that finished more than GRADING_JOB_TTL seconds ago"""
+    cutoff = time.time() - GRADING_JOB_TTL
+    for job_id in [job_id for job_id, job in grading_jobs.items() if job["finished_at"] and job["finished_at"] < cutoff]:
+        del grading_jobs[job_id]
+
+async def run_grading_job(job: dict, directory: str, names: dict):
+    loop = asyncio.get_running_loop()
+    
+    def score(chunks):
+        # Sentiment goes through the shared NLP executor, so jobs reuse the
+        # loaded pipeline and respect its queue limit; a background job
+        # waits for room instead of failing
+        while True:
+            try:
+                return asyncio.run_coroutine_threadsafe(nlp_executor.run(sentiment_scores, chunks), loop).result()
+            except InferenceQueueFull:
+                time.sleep(0.5)
+    
+    def consume():
+        for result in grade_files(list(names), BULK_GRADING_WORKERS, pool=get_grading_pool(), score=score):
+            result["file"] = names[result["file"]]
+            job["results"].append(result)
+    
+    try:
+        await asyncio.to_thread(consume)
+        job["status"] = "finished"
+    except Exception as exc:
+        job["status"] = "failed"
+        job["error"] = str(exc)
+    finally:
+        job["finished_at"] = time.time()
+        shutil.rmtree(directory, ignore_errors=True)
+
+async def save_uploads(submissions: List[UploadFile], directory: str) -> dict:
+    """Copy uploads into `directory` without blocking the loop; 413 past the
+    per-file or per-job size limit"""
+    names = {}
+    total = 0
+    for i, upload in enumerate(submissions):
+        path = os.path.join(directory, f"{i:05d}{os.path.splitext(upload.filename)[1].lower()}")
+        size = 0
+        with open(path, 'wb') as out:
+            while block := await upload.read(UPLOAD_READ_SIZE):
+                size += len(block)
+                total += len(block)
+                if size > ASSIGNMENT_UPLOAD_LIMIT:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"{upload.filename} is too large (limit {ASSIGNMENT_UPLOAD_LIMIT // (1024 * 1024)} MB)"
+                    )
+                if total > BULK_GRADING_UPLOAD_LIMIT:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Upload too large (limit {BULK_GRADING_UPLOAD_LIMIT // (1024 * 1024)} MB per job)"
+                    )
+                out.write(block)
+        names[path] = upload.filename
+    return names
+
+def grading_job_summary(job: dict) -> dict:
+    elapsed = (job["finished_at"] or time.time()) - job["started_at"]
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "error": job["error"],
+        "files_total": job["files_total"],
+        "files_done": len(job["results"]),
+        "seconds": round(elapsed, 2),
+        "files_per_second": round(len(job["results"]) / elapsed, 2) if elapsed > 0 else 0
+    }
+
+def get_grading_job(job_id: str, current_user: dict) -> dict:
+    prune_grading_jobs()
+    job = grading_jobs.get(job_id)
+    if job is None or job["owner"] != current_user.get("sub"):
+        raise HTTPException(status_code=404, detail="Grading job not found")
+    return job
+
+@router.post("/grading-jobs", status_code=202)
+async def create_grading_job(
+    files: List[UploadFile] = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    # Only advisors can bulk-grade
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    submissions = [f for f in files if (f.filename or "").lower().endswith(SUBMISSION_EXTENSIONS)]
+    if not submissions:
+        raise HTTPException(status_code=400, detail="No .txt or .md submissions uploaded")
+    
+    prune_grading_jobs()
+    if running_grading_jobs() >= BULK_GRADING_MAX_JOBS:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Grading is saturated ({BULK_GRADING_MAX_JOBS} jobs running), try again later"
+        )
+    
+    # Registered before the first await, so concurrent requests count it
+    # against BULK_GRADING_MAX_JOBS while its uploads are copied
+    job = {
+        "id": uuid.uuid4().hex,
+        "owner": current_user.get("sub"),
+        "status": "running",
+        "error": None,
+        "files_total": len(submissions),
+        "results": [],
+        "started_at": time.time(),
+        "finished_at": None
+    }
+    grading_jobs[job["id"]] = job
+    
+    # Copy uploads to a job directory the metric processes can read
+    directory = tempfile.mkdtemp(prefix="grading-")
+    try:
+        names = await save_uploads(submissions, directory)
+    except BaseException:
+        del grading_jobs[job["id"]]
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    job["task"] = asyncio.create_task(run_grading_job(job, directory, names))
+    
+    return {
+        **grading_job_summary(job),
+        "status_url": f"/api/predictions/grading-jobs/{job['id']}",
+        "results_url": f"/api/predictions/grading-jobs/{job['id']}/results"
+    }
+
+@router.get("/grading-jobs/{job_id}")
+async def grading_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    return grading_job_summary(get_grading_job(job_id, current_user))
+
+@router.get("/grading-jobs/{job_id}/results")
+async def grading_job_results(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = get_grading_job(job_id, current_user)
+    
+    # NDJSON, one line per file as it finishes, then a summary line
+    async def stream():
+        sent = 0
+        while True:
+            finished = job["status"] != "running"
+            results = job["results"]
+            while sent < len(results):
+                yield json.dumps(results[sent]) + "\n"
+                sent += 1
+            if finished:
+                break
+            await asyncio.sleep(0.2)
+        yield json.dumps({"summary": grading_job_summary(job)}) + "\n"
     
-    result = analyze_assignment(assignment.text)
-    return result
\ No newline at end of file
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
\ No newline at end of file
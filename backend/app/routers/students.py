@@ -1,15 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.student import Student
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import engine, get_async_db
+from app.models.student import GPA_KEY, RISK_SCORE_KEY, Student
 from app.models.user import User
 from app.auth import get_current_user
-from typing import List
+from app.cache import TTLCache
+from app.ml.feature_store import record_assignment, record_attendance, update_features
+from app.ml.risk_summary import list_cohorts, load_risk_summary
+from typing import List, Optional
 from pydantic import BaseModel
 from uuid import UUID
+import base64
+import csv
+import io
+import json
+import os
+import zlib
 
 router = APIRouter()
 
+# /me is polled on every page load; risk fields lag rescoring by at most the TTL
+profile_cache = TTLCache(
+    max_size=int(os.getenv("PROFILE_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("PROFILE_CACHE_TTL", 30))
+)
+
+# /all returns one page at a time; X-Next-Cursor points at the next one
+STUDENT_PAGE_SIZE = int(os.getenv("STUDENT_PAGE_SIZE", 100))
+STUDENT_PAGE_MAX = int(os.getenv("STUDENT_PAGE_MAX", 1000))
+# NULL risk scores and GPAs sort as 0 (see RISK_SCORE_KEY/GPA_KEY), matching
+# the coalesced values STUDENT_COLUMNS returns and the cursor carries
+STUDENT_SORTS = {"risk_score": RISK_SCORE_KEY, "gpa": GPA_KEY, "id": Student.id}
+
+def encode_cursor(sort: str, value, student_pk: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort, value, student_pk]).encode()).decode()
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """(sort value, id) of the last row already returned"""
+    try:
+        cursor_sort, value, student_pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order")
+    # Sort values are never NULL (STUDENT_COLUMNS coalesces them): ids are
+    # strings, scores and GPAs numbers. bool is an int subclass, so exclude it
+    expected = str if sort.lstrip("-") == "id" else (int, float)
+    if isinstance(value, bool) or not isinstance(value, expected) or not isinstance(student_pk, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, student_pk
+
+def keyset_after(column, value, student_pk: str, descending: bool):
+    """Rows strictly after (value, student_pk) in the page order.
+
+    Spelled as `column <= value AND (column < value OR id < pk)` rather
+    than a row-value comparison, which SQLite can't seek on when the sort
+    key is an expression index
+    """
+    if column is Student.id:
+        return Student.id < student_pk if descending else Student.id > student_pk
+    if descending:
+        return and_(column <= value, or_(column < value, Student.id < student_pk))
+    return and_(column >= value, or_(column > value, Student.id > student_pk))
+
+def student_filters(
+    risk_level: Optional[List[str]] = Query(None),
+    min_gpa: Optional[float] = None,
+    max_gpa: Optional[float] = None,
+    min_risk_score: Optional[int] = None
+) -> list:
+    """WHERE clauses shared by the roster listing and export endpoints"""
+    filters = []
+    if risk_level:
+        filters.append(Student.risk_level.in_(risk_level))
+    if min_gpa is not None:
+        filters.append(Student.gpa >= min_gpa)
+    if max_gpa is not None:
+        filters.append(Student.gpa <= max_gpa)
+    if min_risk_score is not None:
+        filters.append(Student.risk_score >= min_risk_score)
+    return filters
+
+# The StudentResponse fields. Read paths select just these as plain Rows, so
+# no ORM objects (or password hashes and timestamps) are loaded, and hand the
+# dicts to ORJSONResponse, skipping response_model re-validation. Nullable
+# columns are coalesced to the model defaults, so every row still fits
+# StudentResponse without that validation
+STUDENT_COLUMNS = {
+    "id": Student.id,
+    "name": User.name,
+    "email": User.email,
+    "student_id": Student.student_id,
+    "gpa": GPA_KEY.label("gpa"),
+    "risk_score": RISK_SCORE_KEY.label("risk_score"),
+    "risk_level": func.coalesce(Student.risk_level, literal_column("'low'")).label("risk_level")
+}
+
+def student_rows():
+    return select(*STUDENT_COLUMNS.values()).join_from(Student, User, Student.user_id == User.id)
+
+# /export streams straight from a server-side cursor, EXPORT_BATCH_ROWS at a
+# time, so memory stays flat however large the roster is
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", 2000))
+
+def export_rows(query, fmt: str, gzip: bool):
+    """Yield the result of `query` as NDJSON or CSV bytes, one batch per chunk.
+
+    Runs in Starlette's threadpool on its own connection, since the request's
+    session is gone by the time the body is sent. Gzip output is sync-flushed
+    per batch so the client sees the first rows without waiting for the rest.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    names = list(STUDENT_COLUMNS)
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        if compressor:
+            data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    if fmt == "csv":
+        yield encode(",".join(names) + "\r\n")
+
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_BATCH_ROWS).execute(query)
+        for rows in result.partitions():
+            if fmt == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                yield encode(buffer.getvalue())
+            else:
+                yield encode("".join(json.dumps(dict(zip(names, row))) + "\n" for row in rows))
+
+    if compressor:
+        yield compressor.flush()
+
 class StudentResponse(BaseModel):
     id: str
     name: str
@@ -22,73 +149,180 @@ class StudentResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("/me", response_model=StudentResponse)
+class AttendanceEvent(BaseModel):
+    attended: bool
+
+class AssignmentEvent(BaseModel):
+    completed: bool
+
+class FeatureUpdate(BaseModel):
+    age: Optional[int] = None
+    previous_gpa: Optional[float] = None
+    current_gpa: Optional[float] = None
+    study_hours_per_week: Optional[int] = None
+    forum_posts: Optional[int] = None
+    financial_aid: Optional[int] = None
+    part_time_job: Optional[int] = None
+    commute_time: Optional[int] = None
+
+@router.get("/me", response_model=StudentResponse, response_class=ORJSONResponse)
 async def get_my_profile(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == current_user["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    student_pk = current_user.get("student_pk")
+    profile = profile_cache.get(student_pk) if student_pk else None
+    if profile is not None:
+        return ORJSONResponse(profile)
     
-    student = db.query(Student).filter(Student.user_id == user.id).first()
-    if not student:
+    # A primary-key lookup when the token carries student_pk; older tokens
+    # without it fall back to the user's id
+    key = Student.id == student_pk if student_pk else User.id == current_user.get("user_id")
+    row = (await db.execute(student_rows().where(key))).first()
+    profile = row._asdict() if row else None
+    
+    if not profile:
         raise HTTPException(status_code=404, detail="Student profile not found")
     
-    return {
-        "id": str(student.id),
-        "name": user.name,
-        "email": user.email,
-        "student_id": student.student_id,
-        "gpa": float(student.gpa),
-        "risk_score": student.risk_score,
-        "risk_level": student.risk_level
-    }
-
-@router.get("/all", response_model=List[StudentResponse])
+    profile_cache.set(profile["id"], profile)
+    return ORJSONResponse(profile)
+
+@router.get("/all", response_model=List[StudentResponse], response_class=ORJSONResponse)
 async def get_all_students(
+    limit: int = Query(STUDENT_PAGE_SIZE, ge=1, le=STUDENT_PAGE_MAX),
+    cursor: Optional[str] = None,
+    sort: str = Query("-risk_score", pattern=f"^-?({'|'.join(STUDENT_SORTS)})$"),
+    filters: list = Depends(student_filters),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Only advisors can view all students
     if current_user.get("user_type") != "advisor":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    students = db.query(Student, User).join(User, Student.user_id == User.id).all()
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    column = STUDENT_SORTS[name]
+    query = (
+        student_rows()
+        .where(*filters)
+        .order_by(*((column.desc(), Student.id.desc()) if descending else (column, Student.id)))
+    )
     
-    result = []
-    for student, user in students:
-        result.append({
-            "id": str(student.id),
-            "name": user.name,
-            "email": user.email,
-            "student_id": student.student_id,
-            "gpa": float(student.gpa),
-            "risk_score": student.risk_score,
-            "risk_level": student.risk_level
-        })
+    # Keyset: resume strictly after the last row of the previous page, so
+    # deep pages cost the same as the first
+    if cursor:
+        value, student_pk = decode_cursor(cursor, sort)
+        query = query.where(keyset_after(column, value, student_pk, descending))
     
-    return result
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        # The body stays a plain list; the next page is advertised in a header
+        headers["X-Next-Cursor"] = encode_cursor(sort, getattr(last, name), last.id)
+    
+    return ORJSONResponse([row._asdict() for row in rows], headers=headers)
 
-@router.get("/{student_id}", response_model=StudentResponse)
+@router.get("/summary")
+async def get_risk_summary(
+    cohort: Optional[int] = None,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Only advisors can view cohort-wide aggregates
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Reads the risk_summary table, a few dozen rows at any roster size
+    def load(session):
+        conn = session.connection()
+        return {**load_risk_summary(conn, cohort), "cohorts": list_cohorts(conn)}
+    
+    return await db.run_sync(load)
+
+@router.get("/export")
+async def export_students(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: list = Depends(student_filters),
+    current_user: dict = Depends(get_current_user)
+):
+    # Only advisors can export the roster
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    query = student_rows().where(*filters).order_by(Student.id)
+    gzip = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"Content-Disposition": f'attachment; filename="students.{format}"', "Vary": "Accept-Encoding"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(export_rows(query, format, gzip), media_type=media_type, headers=headers)
+
+@router.get("/{student_id}", response_model=StudentResponse, response_class=ORJSONResponse)
 async def get_student_by_id(
     student_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    student = db.query(Student, User).join(User, Student.user_id == User.id).filter(Student.id == student_id).first()
+    row = (await db.execute(student_rows().where(Student.id == student_id))).first()
     
-    if not student:
+    if not row:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    student_obj, user_obj = student
-    
-    return {
-        "id": str(student_obj.id),
-        "name": user_obj.name,
-        "email": user_obj.email,
-        "student_id": student_obj.student_id,
-        "gpa": float(student_obj.gpa),
-        "risk_score": student_obj.risk_score,
-        "risk_level": student_obj.risk_level
-    }
\ No newline at end of file
+    return ORJSONResponse(row._asdict())
+
+@router.post("/{student_id}/attendance")
+async def add_attendance(
+    student_id: str,
+    event: AttendanceEvent,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Only advisors can record attendance
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    updated = await db.run_sync(lambda session: record_attendance(session.connection(), student_id, event.attended))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Student not found")
+    await db.commit()
+    return {"message": "Attendance recorded"}
+
+@router.post("/{student_id}/assignments")
+async def add_assignment(
+    student_id: str,
+    event: AssignmentEvent,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Only advisors can record assignments
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    updated = await db.run_sync(lambda session: record_assignment(session.connection(), student_id, event.completed))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Student not found")
+    await db.commit()
+    return {"message": "Assignment recorded"}
+
+@router.patch("/{student_id}/features")
+async def edit_features(
+    student_id: str,
+    changes: FeatureUpdate,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Only advisors can edit features
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    values = changes.model_dump(exclude_none=True)
+    updated = await db.run_sync(lambda session: update_features(session.connection(), student_id, values))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Student not found")
+    await db.commit()
+    return {"message": "Features updated"}
\ No newline at end of file
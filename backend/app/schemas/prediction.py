@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List
+
+class PredictionInput(BaseModel):
+    age: int = 20
+    previous_gpa: float = 3.0
+    current_gpa: float = 3.0
+    attendance_rate: float = 85.0
+    assignment_completion: float = 80.0
+    study_hours_per_week: int = 15
+    forum_posts: int = 10
+    days_since_last_login: int = 2
+    financial_aid: int = 0
+    part_time_job: int = 0
+    commute_time: int = 30
+
+class PredictionResponse(BaseModel):
+    dropout_risk: int
+    dropout_probability: float
+    predicted_gpa: float
+    risk_level: str
+    recommendations: List[str]
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+
+# Requests/s of a handler doing one query, through the sync Session (what the
+# routers used to do, blocking the event loop) vs. the AsyncSession, as the
+# number of in-flight requests grows. SQLite answers in microseconds, so each
+# query also calls sleep_ms() to stand in for a Postgres round trip:
+#   python benchmark_async_db.py --round-trip-ms 20 --concurrency 1 4 16 64
+SCRATCH_DIR = tempfile.mkdtemp(prefix="async-db-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Base, SessionLocal, async_engine, engine, get_async_db
+from app.models.user import User
+
+DURATION = 5  # seconds per run
+
+def add_sleep_function(dbapi_connection, connection_record):
+    # aiosqlite wraps the sqlite3 connection; the function runs on its thread
+    raw = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    raw = getattr(raw, "_conn", raw)
+    raw.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+event.listen(engine, "connect", add_sleep_function)
+event.listen(async_engine.sync_engine, "connect", add_sleep_function)
+
+def make_app(round_trip_ms):
+    app = FastAPI()
+    query = select(func.count(User.id), func.sleep_ms(round_trip_ms))
+
+    # The session is closed inside the handler: with the threadpool-run get_db
+    # teardown, more requests in flight than pooled connections can freeze the
+    # loop in a checkout until the pool timeout, which is a separate failure
+    @app.get("/sync")
+    async def sync_query():
+        with SessionLocal() as db:
+            return {"count": db.execute(query).first()[0]}
+
+    @app.get("/async")
+    async def async_query(db: AsyncSession = Depends(get_async_db)):
+        return {"count": (await db.execute(query)).first()[0]}
+
+    return app
+
+async def measure(app, path, concurrency):
+    completed = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def client(http):
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            response = await http.get(path)
+            response.raise_for_status()
+            completed += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return completed / elapsed
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    app = make_app(args.round_trip_ms)
+
+    print("=" * 50)
+    print(f"SYNC vs ASYNC SESSION (requests/s, {args.round_trip_ms} ms per query)")
+    print("=" * 50)
+    print(f"   {'in flight':>9} {'sync':>8} {'async':>8} {'speedup':>8}")
+    for concurrency in args.concurrency:
+        sync_rps = await measure(app, "/sync", concurrency)
+        async_rps = await measure(app, "/async", concurrency)
+        print(f"   {concurrency:>9} {sync_rps:>8.1f} {async_rps:>8.1f} {async_rps / sync_rps:>7.1f}x")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--round-trip-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,105 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import httpx
+
+# Time-to-first-byte, total time and server peak RSS of /api/students/export
+# at growing roster sizes (Linux only). Seeds a scratch SQLite database, then
+# starts a fresh `uvicorn main:app` per measurement so VmHWM covers just that
+# one export:
+#   python benchmark_export.py --rows 10000 100000 1000000
+SCRATCH_DIR = tempfile.mkdtemp(prefix="export-bench-")
+DATABASE_URL = f"sqlite:///{os.path.join(SCRATCH_DIR, 'bench.db')}"
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert
+from app.auth import create_access_token
+from app.database import Base, engine
+from app.models.student import Student
+from app.models.user import User
+
+VARIANTS = [("ndjson", False), ("ndjson", True), ("csv", True)]
+
+def seed(start, stop, rng, batch=20000):
+    for offset in range(start, stop, batch):
+        users, students = [], []
+        for i in range(offset, min(offset + batch, stop)):
+            user_id = str(uuid.uuid4())
+            risk_score = rng.randint(0, 100)
+            users.append({"id": user_id, "email": f"student{i}@university.edu", "name": f"Student {i}",
+                          "password_hash": "x", "user_type": "student"})
+            students.append({"id": str(uuid.uuid4()), "user_id": user_id, "student_id": f"STU{i:08d}",
+                             "gpa": round(rng.uniform(0, 4), 2), "risk_score": risk_score,
+                             "risk_level": "high" if risk_score > 70 else "medium" if risk_score > 40 else "low"})
+        with engine.begin() as conn:
+            conn.execute(insert(User.__table__), users)
+            conn.execute(insert(Student.__table__), students)
+
+def memory_kb(pid):
+    values = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith(('VmRSS:', 'VmHWM:')):
+                values[line.split(':')[0]] = int(line.split()[1])
+    return values
+
+def measure(fmt, gzip, port):
+    env = dict(os.environ, MODEL_WARMUP="false", NLP_WARMUP="false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"], env=env
+    )
+    try:
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            try:
+                httpx.get(f"http://localhost:{port}/health", timeout=2)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.3)
+        idle = memory_kb(server.pid)["VmRSS"]
+
+        token = create_access_token(data={"sub": "bench@university.edu", "user_type": "advisor", "user_id": "bench"})
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip" if gzip else "identity"}
+        received = 0
+        started = time.perf_counter()
+        first_byte = None
+        with httpx.stream("GET", f"http://localhost:{port}/api/students/export", params={"format": fmt},
+                          headers=headers, timeout=600) as response:
+            for chunk in response.iter_raw():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+                received += len(chunk)
+        total = time.perf_counter() - started
+        return {"ttfb_ms": first_byte * 1000, "seconds": total, "mb": received / 1e6,
+                "peak_mb": (memory_kb(server.pid)["VmHWM"] - idle) / 1024}
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--port", type=int, default=8040)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+
+    print("=" * 50)
+    print("ROSTER EXPORT (server peak RSS above idle)")
+    print("=" * 50)
+    print(f"   {'rows':>9} {'format':<12} {'TTFB':>8} {'total':>8} {'body MB':>8} {'peak RSS':>9}")
+    seeded = 0
+    for rows in sorted(args.rows):
+        seed(seeded, rows, rng)
+        seeded = rows
+        for fmt, gzip in VARIANTS:
+            r = measure(fmt, gzip, args.port)
+            label = f"{fmt}{'+gzip' if gzip else ''}"
+            print(f"   {rows:>9,} {label:<12} {r['ttfb_ms']:>6.1f}ms {r['seconds']:>7.2f}s {r['mb']:>8.1f} {r['peak_mb']:>7.1f}MB")
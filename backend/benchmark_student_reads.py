@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from typing import List
+
+# Read path of the student endpoints before and after column projection:
+# full ORM Student/User objects -> dicts -> response_model validation ->
+# json.dumps, vs. seven-column Rows -> dicts -> orjson. Both run on the same
+# sync session against a scratch SQLite roster, so only the read and
+# serialization work differs:
+#   python benchmark_student_reads.py --students 10000 --page 1000
+SCRATCH_DIR = tempfile.mkdtemp(prefix="student-reads-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from app.database import Base, SessionLocal, engine
+from app.models.student import Student
+from app.models.user import User
+from app.routers.students import StudentResponse, student_rows
+
+one_student = TypeAdapter(StudentResponse)
+many_students = TypeAdapter(List[StudentResponse])
+
+def orm_dict(student, user):
+    return {
+        "id": str(student.id),
+        "name": user.name,
+        "email": user.email,
+        "student_id": student.student_id,
+        "gpa": float(student.gpa),
+        "risk_score": student.risk_score,
+        "risk_level": student.risk_level
+    }
+
+def respond(adapter, content):
+    # What FastAPI does with a response_model: validate, dump, json.dumps
+    return json.dumps(adapter.dump_python(adapter.validate_python(content), mode="json")).encode()
+
+def by_id_before(db, student_pk, user_id, page):
+    student, user = db.query(Student, User).join(User, Student.user_id == User.id).filter(Student.id == student_pk).first()
+    return respond(one_student, orm_dict(student, user))
+
+def by_id_after(db, student_pk, user_id, page):
+    return orjson.dumps(db.execute(student_rows().where(Student.id == student_pk)).first()._asdict())
+
+def all_before(db, student_pk, user_id, page):
+    rows = db.query(Student, User).join(User, Student.user_id == User.id).order_by(Student.risk_score.desc(), Student.id.desc()).limit(page).all()
+    return respond(many_students, [orm_dict(student, user) for student, user in rows])
+
+def all_after(db, student_pk, user_id, page):
+    rows = db.execute(student_rows().order_by(Student.risk_score.desc(), Student.id.desc()).limit(page)).all()
+    return orjson.dumps([row._asdict() for row in rows])
+
+# /me and /{student_id} run the same primary-key lookup
+ENDPOINTS = [("/me, /{id}", by_id_before, by_id_after), ("/all", all_before, all_after)]
+
+def seed(count, rng):
+    users, students = [], []
+    for i in range(count):
+        user_id = str(uuid.uuid4())
+        users.append({"id": user_id, "email": f"student{i}@university.edu", "name": f"Student {i}",
+                      "password_hash": "$2b$12$" + "x" * 53, "user_type": "student"})
+        students.append({"id": str(uuid.uuid4()), "user_id": user_id, "student_id": f"STU{i:08d}",
+                         "gpa": round(rng.uniform(0, 4), 2), "risk_score": rng.randint(0, 100), "risk_level": "low"})
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), users)
+        conn.execute(insert(Student.__table__), students)
+    return [(s["id"], s["user_id"]) for s in students]
+
+def measure(fn, targets, page, repeats):
+    # A fresh session per call, like a request, so the identity map starts empty
+    timings = []
+    for i in range(repeats):
+        student_pk, user_id = targets[i % len(targets)]
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            fn(db, student_pk, user_id, page)
+            timings.append(time.perf_counter() - started)
+
+    student_pk, user_id = targets[0]
+    with SessionLocal() as db:
+        tracemalloc.start()
+        fn(db, student_pk, user_id, page)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return sorted(timings)[len(timings) // 2], peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--page", type=int, default=1000, help="rows per /all call")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    targets = seed(args.students, random.Random(42))
+
+    print("=" * 50)
+    print("STUDENT READ PATHS (median time, peak traced KB per call)")
+    print("=" * 50)
+    print(f"   {'endpoint':<14} {'rows':>5} {'before µs/row':>14} {'after µs/row':>13} {'before KB':>10} {'after KB':>9}")
+    for name, before, after in ENDPOINTS:
+        rows = args.page if name == "/all" else 1
+        repeats = max(args.repeats // 10, 5) if name == "/all" else args.repeats
+        before_time, before_peak = measure(before, targets, args.page, repeats)
+        after_time, after_peak = measure(after, targets, args.page, repeats)
+        print(f"   {name:<14} {rows:>5} {before_time / rows * 1e6:>14.1f} {after_time / rows * 1e6:>13.1f} "
+              f"{before_peak / 1024:>10.1f} {after_peak / 1024:>9.1f}")
@@ -0,0 +1,82 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+import httpx
+
+# Per-worker memory with pickled vs memory-mapped models (Linux only).
+# Starts `uvicorn main:app --workers N` for each worker count and mode, then
+# reads RSS and PSS (RSS with shared pages split between sharers) from /proc.
+#   python benchmark_worker_memory.py --workers 1 4 8
+
+def children_of(pid):
+    result = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            result.append(int(entry))
+    return result
+
+def memory_kb(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0][:-1]] = int(parts[1])
+    return values
+
+def measure(workers, mmap, port):
+    env = dict(os.environ, MODEL_MMAP="true" if mmap else "false", MODEL_WARMUP="true")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        # Wait until every worker has started and warmed up its models
+        deadline = time.time() + 120
+        while time.time() < deadline:
+            try:
+                if httpx.get(f"http://localhost:{port}/health", timeout=2).json()["models"]["gpa"]:
+                    if workers == 1 or len(children_of(server.pid)) >= workers:
+                        break
+            except (httpx.HTTPError, KeyError, TypeError):
+                pass
+            time.sleep(0.5)
+        time.sleep(3)
+
+        # A single worker runs in the uvicorn process itself; with several,
+        # the supervisor may also own helper processes, so keep the largest N
+        pids = [server.pid] if workers == 1 else children_of(server.pid)
+        stats = sorted((memory_kb(pid) for pid in pids), key=lambda m: m['Rss'], reverse=True)[:workers]
+        return {
+            "rss": sum(m['Rss'] for m in stats) / len(stats) / 1024,
+            "pss": sum(m['Pss'] for m in stats) / len(stats) / 1024,
+            "total_pss": sum(m['Pss'] for m in stats) / 1024
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--port", type=int, default=8020)
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("PER-WORKER MEMORY (MB)")
+    print("=" * 50)
+    print(f"   {'mode':<8} {'workers':>7} {'RSS/worker':>11} {'PSS/worker':>11} {'total PSS':>10}")
+    for mmap in (False, True):
+        for workers in args.workers:
+            result = measure(workers, mmap, args.port)
+            mode = "mmap" if mmap else "pickle"
+            print(f"   {mode:<8} {workers:>7} {result['rss']:>11.1f} {result['pss']:>11.1f} {result['total_pss']:>10.1f}")
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import time
+import httpx
+from app.auth import create_access_token
+
+# Load test: /health latency while the inference endpoints (or bcrypt-heavy
+# logins) are saturated. Start the API first (uvicorn main:app), then run:
+#   python load_test_inference.py --url http://localhost:8000 --concurrency 32
+#   python load_test_inference.py --endpoint login --concurrency 32
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+
+async def probe_health(client, duration, latencies):
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+async def hammer(client, endpoint, payload, headers, stop, statuses):
+    while not stop.is_set():
+        response = await client.post(endpoint, json=payload, headers=headers)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+async def run(args):
+    token = create_access_token(data={"sub": "loadtest@smartscholar.dev", "user_type": "advisor", "user_id": "loadtest"})
+    headers = {"Authorization": f"Bearer {token}"}
+    if args.endpoint == "login":
+        endpoint, payload = "/api/auth/login", {"email": "loadtest@smartscholar.dev", "password": "load-test-password"}
+    elif args.endpoint == "predict-batch":
+        endpoint, payload = "/api/predictions/predict-batch", [{"attendance_rate": 40 + i % 60} for i in range(args.rows)]
+    else:
+        endpoint, payload = "/api/predictions/analyze-assignment", {"text": "The essay argues a clear point. " * 200}
+
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        if args.endpoint == "login":
+            # 400 when the account already exists from an earlier run
+            await client.post("/api/auth/signup", json={"name": "Load Test", "user_type": "advisor", **payload})
+        idle = []
+        await probe_health(client, args.duration, idle)
+
+        loaded, statuses = [], {}
+        stop = asyncio.Event()
+        workers = [asyncio.create_task(hammer(client, endpoint, payload, headers, stop, statuses)) for _ in range(args.concurrency)]
+        await probe_health(client, args.duration, loaded)
+        stop.set()
+        await asyncio.gather(*workers)
+
+    print("=" * 50)
+    print(f"/health latency, {args.concurrency} concurrent {endpoint} callers")
+    print("=" * 50)
+    print(f"   idle:   p50 {percentile(idle, 50):.2f} ms   p99 {percentile(idle, 99):.2f} ms   ({len(idle)} probes)")
+    print(f"   loaded: p50 {percentile(loaded, 50):.2f} ms   p99 {percentile(loaded, 99):.2f} ms   ({len(loaded)} probes)")
+    print(f"   {endpoint} responses by status: {statuses}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", choices=["predict-batch", "analyze-assignment", "login"], default="predict-batch")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    asyncio.run(run(parser.parse_args()))
@@ -1,15 +1,23 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
 from app.routers import students, auth, predictions
-from app.database import engine, Base
+from app.database import SQLITE_PRAGMAS, async_engine, engine, pool_stats, Base
+from app.auth import get_current_user
 import os
+import argparse
+import asyncio
+import time
 from app.routers import auth, students, predictions
 
 # Import models
 from app.models import User, Student
-
-# Create all tables automatically
-Base.metadata.create_all(bind=engine)
+from app.ml.registry import model_registry
+from app.ml.feature_store import backfill_feature_rows
+from app.ml.risk_summary import ensure_risk_summary
+from app.ml.rescore import run_periodically as rescore_periodically
 
 app = FastAPI(
     title="SmartScholar API",
@@ -24,25 +32,130 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide non-safelisted response headers unless exposed
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Schema setup runs at startup rather than on import, so process pool workers
+# spawned with this module as __main__ don't repeat it
+def prepare_database():
+    # Create all tables automatically
+    Base.metadata.create_all(bind=engine)
+
+    # create_all skips tables that already exist, so add indexes introduced
+    # since an existing database was created. IF NOT EXISTS rather than
+    # checkfirst, which can't reflect expression indexes
+    with engine.begin() as conn:
+        for index in Student.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+    # Dashboard aggregates for databases that predate the risk_summary table, and
+    # feature rows for students created before student_features existed, so
+    # attendance/assignment events always have a row to update
+    with engine.begin() as conn:
+        ensure_risk_summary(conn)
+        backfill_feature_rows(conn)
+
+@app.on_event("startup")
+async def set_up_database():
+    await asyncio.to_thread(prepare_database)
+
+# Load ML models before the first request and optionally watch for retrains
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+
+@app.on_event("startup")
+async def load_ml_models():
+    if MODEL_WARMUP:
+        await asyncio.to_thread(model_registry.warmup)
+    model_registry.start_watcher(float(os.getenv("MODEL_WATCH_INTERVAL", 0)))
+
+# Warm the transformer pipeline in the background so the API answers
+# immediately; /ready reports 503 until the dummy inference has run
+NLP_WARMUP = os.getenv("NLP_WARMUP", "true").lower() == "true"
+
+@app.on_event("startup")
+async def warm_up_nlp():
+    if NLP_WARMUP:
+        app.state.nlp_warmup_task = asyncio.create_task(predictions.warmup_nlp())
+
+# Optionally keep students.risk_score/risk_level fresh in the background;
+# with several uvicorn workers only the one holding the rescore lock runs it
+@app.on_event("startup")
+async def schedule_rescoring():
+    interval = float(os.getenv("RESCORE_INTERVAL_MINUTES", 0))
+    if interval > 0:
+        app.state.rescore_task = asyncio.create_task(rescore_periodically(interval))
+
+# aiosqlite keeps a thread per pooled connection that would hold the process
+# open after uvicorn stops
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+
 # Root endpoint
 @app.get("/")
 def read_root():
     return {"message": "SmartScholar API is running!", "version": "1.0.0"}
 
-# Health check - UPDATED
+# Health check: a timed SELECT 1 through the same pool the routers use
+DB_HEALTH_TIMEOUT = float(os.getenv("DB_HEALTH_TIMEOUT", 2))
+
+async def select_one():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def ping_database() -> dict:
+    result = {"type": "SQLite" if async_engine.dialect.name == "sqlite" else "PostgreSQL"}
+    started = time.perf_counter()
+    try:
+        # The timeout also covers waiting for a pooled connection
+        await asyncio.wait_for(select_one(), DB_HEALTH_TIMEOUT)
+        result["connected"] = True
+    except Exception as exc:
+        result.update(connected=False, error=f"{type(exc).__name__}: {exc}"[:200])
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
 @app.get("/health")
-def health_check():
-    # Check which database is being used
-    db_url = os.getenv("DATABASE_URL", "")
-    db_type = "SQLite" if "sqlite" in db_url else "PostgreSQL"
-    
-    return {
-        "status": "healthy",
-        "database": f"{db_type} connected",
-        "database_file": "smartscholar.db" if db_type == "SQLite" else "cloud"
+async def health_check():
+    database = await ping_database()
+    body = {
+        "status": "healthy" if database["connected"] else "unhealthy",
+        "database": database,
+        "models": model_registry.versions()
+    }
+    return body if database["connected"] else JSONResponse(status_code=503, content=body)
+
+# Pool occupancy and checkout waits for the sync and async engines
+@app.get("/diagnostics/database")
+async def database_diagnostics(current_user: dict = Depends(get_current_user)):
+    # Pool and pragma details are for operators, i.e. advisors
+    if current_user.get("user_type") != "advisor":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    diagnostics = {
+        "dialect": engine.dialect.name,
+        "sync_pool": pool_stats(engine),
+        "async_pool": pool_stats(async_engine)
     }
+    if engine.dialect.name == "sqlite":
+        async with async_engine.connect() as conn:
+            diagnostics["pragmas"] = {
+                name: (await conn.execute(text(f"PRAGMA {name}"))).scalar() for name in SQLITE_PRAGMAS
+            }
+    return diagnostics
+
+# Readiness probe - ready once models are loaded and the NLP warmup is done
+@app.get("/ready")
+def readiness_check():
+    nlp = predictions.nlp_status()
+    models = model_registry.versions()
+    nlp_pending = nlp["state"] == "loading" or (nlp["state"] == "not_loaded" and NLP_WARMUP)
+    # Without warmup the models load lazily, so don't wait on them here
+    ready = (all(models.values()) or not MODEL_WARMUP) and not nlp_pending
+    
+    body = {"ready": ready, "models": models, "nlp": nlp}
+    return body if ready else JSONResponse(status_code=503, content=body)
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -51,5 +164,11 @@ app.include_router(predictions.router, prefix="/api/predictions", tags=["Predict
 
 if __name__ == "__main__":
     import uvicorn
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-nlp", action="store_true", help="don't serve assignment feedback or load torch")
+    args = parser.parse_args()
+    if args.no_nlp:
+        os.environ["NLP_ENABLED"] = "false"
+    
     uvicorn.run(app, host="0.0.0.0", port=8000)
     app.include_router(predictions.router, prefix="/api/predictions", tags=["Predictions"])
\ No newline at end of file
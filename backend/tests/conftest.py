@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# main.py and app.database read their settings at import time, so point them
+# at a throwaway SQLite database and keep the heavy models out of startup
+TEST_DIR = tempfile.mkdtemp(prefix="smartscholar-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("NLP_ENABLED", "false")
+os.environ.setdefault("MODEL_WARMUP", "false")
+os.environ.setdefault("NLP_WARMUP", "false")
+os.environ.setdefault("RESCORE_INTERVAL_MINUTES", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
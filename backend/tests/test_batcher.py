@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from app.auth import create_access_token
+from app.ml.batcher import MicroBatcher
+from app.ml.executor import InferenceExecutor
+from app.routers import predictions
+from main import app
+
+def slow_batch(delay):
+    def batch_fn(items):
+        time.sleep(delay)
+        return [{
+            "dropout_risk": 0,
+            "dropout_probability": 0.1,
+            "predicted_gpa": 3.0,
+            "risk_level": "Low",
+            "recommendations": []
+        } for _ in items]
+    return batch_fn
+
+def test_batches_run_on_every_worker():
+    executor = InferenceExecutor("test", max_workers=2, queue_limit=2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def batch_fn(items):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.1)
+        with lock:
+            running -= 1
+        return items
+
+    async def main():
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=1, executor=executor)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(16)))
+
+    try:
+        assert asyncio.run(main()) == list(range(16))
+    finally:
+        executor.shutdown()
+    assert peak == 2
+
+def test_predict_returns_503_when_batcher_is_saturated(monkeypatch):
+    batcher = predictions.prediction_batcher
+    monkeypatch.setattr(predictions, "PREDICTION_BATCHING", True)
+    monkeypatch.setattr(batcher, "batch_fn", slow_batch(0.2))
+    monkeypatch.setattr(batcher, "max_batch_size", 2)
+    monkeypatch.setattr(batcher, "queue_limit", 4)
+    monkeypatch.setattr(predictions.model_registry, "version_key", lambda: None)
+    token = create_access_token(data={"sub": "advisor@example.com", "user_type": "advisor", "user_id": 1})
+    rejected_before = batcher.rejected
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/predictions/predict", json={"age": 18 + i % 10}, headers={"Authorization": f"Bearer {token}"})
+                for i in range(40)
+            ))
+
+    responses = asyncio.run(main())
+    codes = [response.status_code for response in responses]
+    assert 200 in codes
+    assert 503 in codes
+    assert set(codes) == {200, 503}
+    assert any("saturated" in response.json()["detail"] for response in responses if response.status_code == 503)
+    assert batcher.rejected > rejected_before
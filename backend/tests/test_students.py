@@ -0,0 +1,41 @@
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.routers.students import encode_cursor
+from main import app
+
+def tampered(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        token = create_access_token(data={"sub": "advisor@example.com", "user_type": "advisor", "user_id": 1})
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("-risk_score", "not base64 at all"),
+    ("-risk_score", tampered(["-risk_score", 50])),
+    ("-risk_score", tampered(["-risk_score", {"$gt": 0}, "abc"])),
+    ("-risk_score", tampered(["-risk_score", [1, 2], "abc"])),
+    ("-risk_score", tampered(["-risk_score", None, "abc"])),
+    ("-risk_score", tampered(["-risk_score", True, "abc"])),
+    ("-risk_score", tampered(["-risk_score", "50", "abc"])),
+    ("gpa", tampered(["gpa", 3.5, 42])),
+    ("gpa", tampered(["gpa", 3.5, None])),
+    ("id", tampered(["id", 7, "abc"])),
+])
+def test_tampered_cursor_is_rejected(client, sort, cursor):
+    response = client.get("/api/students/all", params={"sort": sort, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+@pytest.mark.parametrize("sort, value", [("-risk_score", 50), ("gpa", 3.5), ("id", "abc")])
+def test_issued_cursor_is_accepted(client, sort, value):
+    response = client.get("/api/students/all", params={"sort": sort, "cursor": encode_cursor(sort, value, "abc")})
+    assert response.status_code == 200
@@ -28,9 +28,35 @@ export const authAPI = {
   getMe: () => api.get('/api/auth/me'),
 }
 
+type StudentListParams = {
+  limit?: number
+  cursor?: string
+  sort?: string
+  risk_level?: string[]
+  min_gpa?: number
+  max_gpa?: number
+  min_risk_score?: number
+}
+
+// /api/students/all returns one page; the next page's cursor comes back in
+// the X-Next-Cursor header and is absent on the last page
+const getStudentsPage = (params: StudentListParams = {}) =>
+  api.get('/api/students/all', { params, paramsSerializer: { indexes: null } })
+
 export const studentAPI = {
   getMyProfile: () => api.get('/api/students/me'),
-  getAllStudents: () => api.get('/api/students/all'),
+  getStudentsPage,
+  // Follows the cursor through every page and resolves like a single
+  // response whose data holds the whole roster
+  getAllStudents: async (params: Omit<StudentListParams, 'cursor'> = {}) => {
+    let response = await getStudentsPage({ limit: 1000, ...params })
+    const students = [...response.data]
+    while (response.headers['x-next-cursor']) {
+      response = await getStudentsPage({ limit: 1000, ...params, cursor: response.headers['x-next-cursor'] })
+      students.push(...response.data)
+    }
+    return { ...response, data: students }
+  },
 }
 
 export default api
\ No newline at end of file